@@ -1,115 +1,296 @@
 import time
+
+# Measures how long each script run takes to reach its first render
+script_start = time.perf_counter()
+
+import json
+import os
 import streamlit as st
 import requests
-import torch
-import joblib
-import pandas as pd
-from model import ComplexTabularModel
-import altair as alt
+import metrics
+from scoring import make_scorer
+from assets import champion_key
+from features import fold_events, snapshot_features
+from history import WinHistory
+from render import Renderer, render_seconds
+from wire import apply_delta, event_list
 
 
 flask_url = "https://353e-103-30-215-137.ngrok-free.app/data"
 summary_url = "https://353e-103-30-215-137.ngrok-free.app/summarize"
+events_url = "https://353e-103-30-215-137.ngrok-free.app/events"
+stream_url = "https://353e-103-30-215-137.ngrok-free.app/stream"
+history_url = "https://353e-103-30-215-137.ngrok-free.app/history"
+server_url = flask_url.rsplit("/", 1)[0]
+assets_url = f"{server_url}/assets/manifest"
+
+# Seconds before the asset manifest is refetched for an unknown champion or item
+assets_refresh = 30
+
+# Seconds between summary refreshes; snapshots arrive as fast as they change
+summary_interval = 5
+
+# (connect, read) timeouts in seconds for requests to send.py
+request_timeout = (3.05, 5)
+
+# Folded NumPy weights written by `python model.py`
+fused_path = "model/fused.npz"
+
+# Optional shared inference service (inference.py); scores locally when unset
+inference_url = os.environ.get("INFERENCE_URL")
+
+# Serves this process's metrics in Prometheus format when set
+metrics_port = int(os.environ.get("DASHBOARD_METRICS_PORT", "0"))
+
+stage_seconds = metrics.histogram("dashboard_stage_seconds", "Time per dashboard pipeline stage", ["stage"])
+dashboard_errors = metrics.counter("dashboard_errors", "Errors shown on the dashboard", ["source"])
 
 def fetch_data():
+    """Fetch the current snapshot as a delta against the one we already hold."""
+    current = st.session_state.wire_snapshot
+    params, headers = {}, {}
+    if current:
+        params["since"] = current["version"]
+        headers["If-None-Match"] = f'"{current["version"]}"'
     try:
-        response = requests.get(flask_url)
+        with stage_seconds.time(stage="fetch"):
+            response = requests.get(flask_url, params=params, headers=headers, timeout=request_timeout)
+        if response.status_code == 304:
+            return current
         response.raise_for_status()
-        return response.json()
+        body = response.json()
     except Exception as e:
+        dashboard_errors.inc(source="data")
         st.error(f"Error fetching data: {e}")
         return {}
 
+    snapshot = apply_delta(current, body) if "base" in body else body
+    st.session_state.wire_snapshot = snapshot
+    return snapshot
+
+def stream_data():
+    """Yield snapshots pushed by /stream, polling /data while it is unreachable."""
+    while True:
+        try:
+            with requests.get(stream_url, params={"delta": 1}, stream=True, timeout=(5, 30)) as response:
+                response.raise_for_status()
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line.startswith("data: "):
+                        continue
+                    message = json.loads(line[len("data: "):])
+                    current = st.session_state.wire_snapshot
+                    if "base" not in message:
+                        st.session_state.wire_snapshot = message
+                    elif current and current.get("version") == message["base"]:
+                        st.session_state.wire_snapshot = apply_delta(current, message)
+                    else:
+                        # Missed a message; resync with a delta from /data
+                        fetch_data()
+                    yield st.session_state.wire_snapshot or {}
+        except Exception as e:
+            dashboard_errors.inc(source="stream")
+            st.error(f"Error reading stream, polling instead: {e}")
+            yield fetch_data()
+            time.sleep(5)
+
+def fetch_history():
+    """Backfill the chart with every tick of the current game, scored by send.py."""
+    try:
+        with stage_seconds.time(stage="history"):
+            response = requests.get(history_url, timeout=request_timeout)
+        response.raise_for_status()
+        body = response.json()
+    except Exception as e:
+        dashboard_errors.inc(source="history")
+        st.error(f"Error fetching win probability history: {e}")
+        return
+
+    st.session_state.win_history.load(
+        body.get("game_time", []), body.get("team_order_win", []), body.get("team_chaos_win", [])
+    )
+    st.session_state.chart_game = body.get("game_id")
+
+
 def fetch_summary():
     """Fetch summary data from the /summarize endpoint."""
     try:
-        response = requests.get(summary_url)
+        with stage_seconds.time(stage="summary"):
+            response = requests.get(summary_url, timeout=request_timeout)
         response.raise_for_status()
         return response.json()
     except Exception as e:
+        dashboard_errors.inc(source="summary")
         st.error(f"Error fetching summary: {e}")
         return {}
 
 
-def calculate_event_gold(player_name, event_data):
-    base_name = player_name.split("#")[0]
-    event_gold = 0
-
-    for event in event_data:
-        if not isinstance(event, dict):
-            continue
-        if event.get("KillerName") == base_name:
-            if event.get("EventName") == "DragonKill":
-                event_gold += 300
-            elif event.get("EventName") == "BaronKill":
-                event_gold += 500
-            elif event.get("EventName") == "TurretKilled":
-                event_gold += 250
-            elif event.get("EventName") == "ChampionKill":
-                event_gold += 300
-        elif base_name in event.get("Assisters", []):
-            if event.get("EventName") == "DragonKill":
-                event_gold += 100
-            elif event.get("EventName") == "BaronKill":
-                event_gold += 200
-
-    return event_gold
-
-
-def calculate_gold(player_name, minions_killed, wards_killed, game_time, event_data):
-    """Estimate gold for a player."""
-    passive_gold_per_10_seconds = 20.4
-    starting_gold = 500
-
-    if game_time >= 110:
-        elapsed_passive_time = game_time - 110
-        passive_gold = (elapsed_passive_time // 10) * passive_gold_per_10_seconds
-    else:
-        passive_gold = 0
-
-    gold_from_minions = minions_killed * 14
-    gold_from_wards = wards_killed * 30
-    gold_from_events = calculate_event_gold(player_name, event_data)
-
-    return starting_gold + passive_gold + gold_from_minions + gold_from_wards + gold_from_events
-
-
-def prepare_model_input(player_data, team_order_gold, team_chaos_gold):
-    """Prepare input features for the model."""
-    team_order_kills = sum(p["scores"].get("kills", 0) for p in player_data if p["team"] == "ORDER")
-    team_order_deaths = sum(p["scores"].get("deaths", 0) for p in player_data if p["team"] == "ORDER")
-    team_order_assists = sum(p["scores"].get("assists", 0) for p in player_data if p["team"] == "ORDER")
-    team_order_cs = sum(p["scores"].get("creepScore", 0) for p in player_data if p["team"] == "ORDER")
-    team_order_kda = team_order_kills / (team_order_deaths if team_order_deaths > 0 else 1)
-
-    team_chaos_kills = sum(p["scores"].get("kills", 0) for p in player_data if p["team"] == "CHAOS")
-    team_chaos_deaths = sum(p["scores"].get("deaths", 0) for p in player_data if p["team"] == "CHAOS")
-    team_chaos_assists = sum(p["scores"].get("assists", 0) for p in player_data if p["team"] == "CHAOS")
-    team_chaos_cs = sum(p["scores"].get("creepScore", 0) for p in player_data if p["team"] == "CHAOS")
-    team_chaos_kda = team_chaos_kills / (team_chaos_deaths if team_chaos_deaths > 0 else 1)
-
-    return [
-        team_order_kills, team_order_deaths, team_order_assists, team_order_gold,
-        team_order_cs, team_order_kda, team_chaos_kills, team_chaos_deaths,
-        team_chaos_assists, team_chaos_gold, team_chaos_cs, team_chaos_kda,
+def fold_snapshot_events(snapshot):
+    """Fold the events past our cursor in a pushed snapshot into the running tallies.
+
+    Stream messages already carry every new event, so /events is only asked
+    when the snapshot has no event list to read.
+    """
+    state = st.session_state
+    events = event_list(snapshot.get("event_data"))
+    if events is None or "event_game_id" not in snapshot:
+        fetch_events()
+        return
+
+    if snapshot["event_game_id"] != state.event_game:
+        state.event_game = snapshot["event_game_id"]
+        state.event_cursor = -1
+        state.event_gold = {}
+        state.event_assists = {}
+
+    new_events = [
+        e for e in events
+        if isinstance(e, dict) and isinstance(e.get("EventID"), int) and e["EventID"] > state.event_cursor
     ]
+    fold_events(new_events, state.event_gold, state.event_assists)
+    if new_events:
+        state.event_cursor = max(e["EventID"] for e in new_events)
+
+
+def fetch_events():
+    """Fetch events past our cursor and fold them into the running tallies."""
+    state = st.session_state
+    try:
+        with stage_seconds.time(stage="events"):
+            response = requests.get(
+                events_url, params={"since": state.event_cursor, "game": state.event_game},
+                timeout=request_timeout
+            )
+        response.raise_for_status()
+        delta = response.json()
+    except Exception as e:
+        dashboard_errors.inc(source="events")
+        st.error(f"Error fetching events: {e}")
+        return
+
+    if delta.get("game_id") != state.event_game:
+        state.event_game = delta.get("game_id")
+        state.event_gold = {}
+        state.event_assists = {}
+
+    fold_events(delta.get("events", []), state.event_gold, state.event_assists)
+    state.event_cursor = delta.get("last_id", state.event_cursor)
 
 
 def predict_win_probability(model_input,game_time):
     """Use the model to predict win probabilities."""
-    scaled_input = scaler.transform([model_input])
-    input_tensor = torch.tensor(scaled_input, dtype=torch.float32)
-    with torch.no_grad():
-        prediction = model(input_tensor)
-        temperature = time_based_temperature(game_time)
-        probs = torch.softmax(prediction / temperature, dim=1)
+    if inference_url:
+        try:
+            with stage_seconds.time(stage="predict_remote"):
+                response = requests.post(inference_url, json={
+                    "features": [float(x) for x in model_input],
+                    "game_time": game_time
+                }, timeout=2)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            dashboard_errors.inc(source="inference")
+            st.error(f"Error from inference service, scoring locally: {e}")
+
+    scorer = load_scorer()
+    with stage_seconds.time(stage="predict"):
+        probs = scorer([model_input], [game_time])
     return {
-        "team_order_win": float(probs[0][1].item() * 100),
-        "team_chaos_win": float(probs[0][0].item() * 100),
+        "team_order_win": float(probs[0][1] * 100),
+        "team_chaos_win": float(probs[0][0] * 100),
     }
 
-def create_win_probability_chart(predictions, chart_type="Bar Chart"):
+@st.cache_resource(show_spinner=False)
+def load_scorer():
+    """Return the (features, game_times) scorer, cached once per process and
+    shared by every session and rerun."""
+    start = time.perf_counter()
+    scorer = make_scorer(fused_path)
+    print(f"Loaded scorer in {time.perf_counter() - start:.3f}s")
+    return scorer
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_server(port):
+    """Start the /metrics HTTP server once per process."""
+    return metrics.start_http_server(port)
+
+
+def record_prediction(predictions, game_time=None):
+    """Add a prediction to the session's win history and return the history."""
+    history = st.session_state.win_history
+    if game_time is None:
+        game_time = history.times[-1] + 5 if len(history) else 0
+    history.append(game_time, predictions['team_order_win'], predictions['team_chaos_win'])
+    return history
+
+
+def history_frame(history, start=0):
+    """Line chart rows for the history points from index `start` on."""
+    import pandas as pd
+    return pd.DataFrame({
+        'Time': history.times[start:],
+        'Team Order': history.order[start:],
+        'Team Chaos': history.chaos[start:]
+    })
+
+
+def current_probabilities(predictions):
+    return f"""
+        Current Probabilities:
+        - Team Order: {predictions['team_order_win']:.1f}%
+        - Team Chaos: {predictions['team_chaos_win']:.1f}%
+        """
+
+
+def draw_line_chart(history, predictions):
+    """Draw the whole history; returns the chart and current-values elements."""
+    df = history_frame(history)
+
+    # Create Altair chart; hovering scrubs a rule through the game and
+    # dragging pans along the time axis
+    import altair as alt
+    scrub = alt.selection_point(nearest=True, on='mouseover', fields=['Time'], empty=False)
+    lines = alt.Chart(df).transform_fold(
+        ['Team Order', 'Team Chaos'], as_=['Team', 'Win Probability']
+    ).encode(
+        x=alt.X('Time:Q', title='Game Time (seconds)'),
+        y=alt.Y('Win Probability:Q', title='Win Probability (%)'),
+        color=alt.Color('Team:N')
+    )
+    rule = alt.Chart(df).mark_rule(color='gray').encode(
+        x='Time:Q',
+        opacity=alt.condition(scrub, alt.value(0.6), alt.value(0)),
+        tooltip=[
+            alt.Tooltip('Time:Q', title='Game Time (s)'),
+            alt.Tooltip('Team Order:Q', format='.1f'),
+            alt.Tooltip('Team Chaos:Q', format='.1f')
+        ]
+    ).add_params(scrub)
+    chart = alt.layer(
+        lines.mark_line(),
+        lines.mark_point(filled=True).encode(
+            opacity=alt.condition(scrub, alt.value(1), alt.value(0))
+        ),
+        rule
+    ).properties(
+        height=400
+    ).interactive(bind_y=False)
+
+    element = st.altair_chart(chart, use_container_width=True)
+
+    # Display current values
+    current = st.empty()
+    current.markdown(current_probabilities(predictions))
+    return element, current
+
+
+def create_win_probability_chart(predictions, chart_type="Bar Chart", game_time=None):
     """Create either a bar chart or line chart for win probabilities."""
+    import pandas as pd
+
+    # Recorded in both modes so switching to the line chart shows the game so far
+    history = record_prediction(predictions, game_time)
+
     if chart_type == "Bar Chart":
         df = pd.DataFrame({
             'Team': ['Team Order', 'Team Chaos'],
@@ -123,75 +304,81 @@ def create_win_probability_chart(predictions, chart_type="Bar Chart"):
             height=400
         )
     else:  # Line Chart
-        current_time = len(st.session_state.historical_predictions) * 5
-        st.session_state.game_times.append(current_time)
-        st.session_state.historical_predictions.append([
-            predictions['team_order_win'],
-            predictions['team_chaos_win']
-        ])
-
-        # Create DataFrame for the chart
-        df = pd.DataFrame({
-            'Time': st.session_state.game_times,
-            'Team Order': [pred[0] for pred in st.session_state.historical_predictions],
-            'Team Chaos': [pred[1] for pred in st.session_state.historical_predictions]
-        })
-
-        # Melt the DataFrame to create a format suitable for Altair
-        df_melted = pd.melt(df, id_vars=['Time'], value_vars=['Team Order', 'Team Chaos'], 
-                           var_name='Team', value_name='Win Probability')
-
-        # Create Altair chart
-        chart = alt.Chart(df_melted).mark_line(point=True).encode(
-            x=alt.X('Time:Q', title='Game Time (seconds)'),
-            y=alt.Y('Win Probability:Q', title='Win Probability (%)'),
-            color=alt.Color('Team:N'),
-            tooltip=['Team:N', 'Win Probability:Q', 'Time:Q']
-        ).properties(
-            height=400
+        return draw_line_chart(history, predictions)
+
+
+def update_line_chart(placeholder, drawn, predictions, game_time):
+    """Keep the line chart drawn in this run up to date.
+
+    New points are sent with add_rows, so a tick costs one row instead of
+    the whole series. The chart is redrawn when the history was reset,
+    thinned or had its last point replaced. drawn holds the chart elements,
+    the history generation and the point count they show.
+    """
+    point = (game_time, predictions['team_order_win'], predictions['team_chaos_win'])
+    if drawn.get("point") == point:
+        return
+    drawn["point"] = point
+
+    history = record_prediction(predictions, game_time)
+    with render_seconds.time(component="chart"):
+        if drawn.get("generation") == history.generation:
+            if len(history) > drawn["size"]:
+                drawn["chart"].add_rows(history_frame(history, drawn["size"]))
+            drawn["current"].markdown(current_probabilities(predictions))
+        else:
+            with placeholder.container():
+                drawn["chart"], drawn["current"] = draw_line_chart(history, predictions)
+    drawn["generation"], drawn["size"] = history.generation, len(history)
+
+
+def fetch_assets(player_data):
+    """Refresh the asset manifest when the game shows a champion or item it lacks."""
+    state = st.session_state
+    manifest = state.assets
+    missing = any(
+        champion_key(p.get('championName', '')) not in manifest['champions']
+        or any(
+            isinstance(item, dict) and str(item.get('itemID')) not in manifest['items']
+            for item in p.get('items', [])
         )
-
-        st.altair_chart(chart, use_container_width=True)
-
-        # Display current values
-        st.markdown(f"""
-        Current Probabilities:
-        - Team Order: {predictions['team_order_win']:.1f}%
-        - Team Chaos: {predictions['team_chaos_win']:.1f}%
-        """)
-
-def time_based_temperature(game_time, max_temp=3.0, min_temp=1.0, max_time=10):
-    if game_time >= max_time:
-        return min_temp
-    else:
-        decay_ratio = game_time / max_time
-        return max_temp - decay_ratio * (max_temp - min_temp)
+        for p in player_data
+    )
+    if not missing or time.monotonic() - state.assets_fetched_at < assets_refresh:
+        return
+    state.assets_fetched_at = time.monotonic()
+    try:
+        with stage_seconds.time(stage="assets"):
+            response = requests.get(assets_url, timeout=request_timeout)
+        response.raise_for_status()
+        manifest = response.json()
+        state.assets = {'champions': manifest.get('champions', {}), 'items': manifest.get('items', {})}
+    except Exception as e:
+        dashboard_errors.inc(source="assets")
+        st.error(f"Error fetching assets: {e}")
 
 
 def get_champion_image_url(champion_name):
-    """Convert champion name to proper format for image URL."""
-    # Handle special cases
-    name_corrections = {
-        "Nunu & Willump": "Nunu",
-        "Renata Glasc": "Renata",
-        "Wukong": "MonkeyKing",
-        # Add more special cases as needed
-    }
-
-    # Use corrected name if it exists, otherwise use original
-    champion_name = name_corrections.get(champion_name, champion_name)
-
-    # Remove spaces and special characters
-    champion_name = champion_name.replace(" ", "").replace("'", "").replace(".", "")
+    """Portrait URL from send.py's asset store, or the CommunityDragon CDN until it has one."""
+    champion_name = champion_key(champion_name)
+    path = st.session_state.assets['champions'].get(champion_name)
+    if path:
+        return server_url + path
 
     # Using the tile endpoint with latest patch
     return f"https://cdn.communitydragon.org/latest/champion/{champion_name}/portrait"
 
 
+def item_info(item):
+    """(name, price) of an item from the asset manifest, or from the item itself."""
+    info = st.session_state.assets['items'].get(str(item.get('itemID')), {})
+    return info.get('name', item.get('displayName', f"Item {item.get('itemID')}")), info.get('price', item.get('price', 0))
+
+
 def display_player_card(player):
     """Create a styled card for player information."""
     champion_name = player.get('championName', 'Unknown')
-    champion_img_url = f"https://cdn.communitydragon.org/latest/champion/{champion_name}/portrait"
+    champion_img_url = get_champion_image_url(champion_name)
 
     # Open the container and add the main content
     st.markdown(f"""
@@ -227,10 +414,11 @@ def display_player_card(player):
             with cols[i]:
                 matching_item = next((item for item in sorted_items if isinstance(item, dict) and item.get('slot') == i), None)
                 if matching_item:
+                    item_name, item_price = item_info(matching_item)
                     st.markdown(f"""
                         <div style='padding: 5px; border: 1px solid #ddd; border-radius: 3px; margin: 2px;'>
-                            <p style='font-size: 12px; margin: 0;'>{matching_item['displayName']}</p>
-                            <p style='font-size: 10px; color: gray; margin: 0;'>Cost: {matching_item['price']}g</p>
+                            <p style='font-size: 12px; margin: 0;'>{item_name}</p>
+                            <p style='font-size: 10px; color: gray; margin: 0;'>Cost: {item_price}g</p>
                         </div>
                     """, unsafe_allow_html=True)
 
@@ -257,154 +445,216 @@ def display_team_stats(team_data, team_name, team_gold):
     return total_kills, total_deaths, total_assists
 
 
-model = ComplexTabularModel(input_dim=12)
-model.load_state_dict(torch.load("model/model.pth"))
-model.eval()
-scaler = joblib.load("model/scaler.pkl")
-
-st.set_page_config(layout="wide")
-st.title("League of Legends Win Prediction")
-
-if 'historical_predictions' not in st.session_state:
-    st.session_state.historical_predictions = []
-    st.session_state.game_times = []
-
-win_prob_tab, teams_tab, summary_tab = st.tabs(["Win Probability", "Team Details", "Game Summary"])
-
-with win_prob_tab:
-    chart_type = st.radio("Select Chart Type", ["Bar Chart", "Line Chart"], horizontal=True)
-    chart_placeholder = st.empty()
-    team_stats_placeholder = st.empty()
-
-with teams_tab:
-    team_details_placeholder = st.empty()
-
-with summary_tab:
-    summary_placeholder = st.empty()
-    summary_data = fetch_summary()
-    if summary_data:
-        with summary_placeholder.container():
-            st.write("### Game Summary")
-            for key, value in summary_data.items():
-                st.markdown(f"""
-                    **{key}**  
-                    {value}
-                    ___
-                """)
-
-while True:
-    data = fetch_data()
-    summary_data = fetch_summary()
-    if data:
-        player_data = data.get("player_data", [])
-        game_stats = data.get("game_stats", {})
-        event_data = data.get("event_data", {})
-        game_time = game_stats.get("gameTime", 0)
-
-        for player in player_data:
-            player['calculated_gold'] = calculate_gold(
-                player["summonerName"],
-                player["scores"]["creepScore"],
-                player["scores"]["wardScore"],
-                game_time,
-                event_data
-            )
+SUMMARY_CSS = """
+<style>
+    .card-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
+        gap: 1.5rem;
+        padding: 1rem;
+    }
+    .summary-card {
+        background: white;
+        padding: 1.5rem;
+        border-radius: 10px;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        transition: transform 0.2s;
+    }
+    .summary-card:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 6px 8px rgba(0,0,0,0.15);
+    }
+    .card-title {
+        font-size: 1.25rem;
+        font-weight: 600;
+        color: #3b82f6;
+        margin-bottom: 1rem;
+        padding-bottom: 0.5rem;
+        border-bottom: 2px solid #e5e7eb;
+    }
+    .card-content {
+        color: #4b5563;
+        line-height: 1.6;
+        white-space: pre-line;
+    }
+</style>
+"""
 
-            if not isinstance(player.get('items'), list):
-                player['items'] = []
 
-            if player['items']:
-                player['items'] = sorted(player['items'],
-                key=lambda x: x.get('slot', 0) if isinstance(x, dict) else 0)
+def display_summary_cards(summary_data):
+    """Render the summary sections as one grid of cards."""
+    cards = "".join(f"""
+        <div class="summary-card">
+            <div class="card-title">{key}</div>
+            <div class="card-content">{value}</div>
+        </div>
+    """ for key, value in summary_data.items())
+    st.markdown(f'<div class="card-grid">{cards}</div>', unsafe_allow_html=True)
 
-        team_order_players = [p for p in player_data if p["team"] == "ORDER"]
-        team_chaos_players = [p for p in player_data if p["team"] == "CHAOS"]
 
-        team_order_gold = sum(p['calculated_gold'] for p in team_order_players)
-        team_chaos_gold = sum(p['calculated_gold'] for p in team_chaos_players)
+def player_card_input(player):
+    """The fields display_player_card shows, used to fingerprint a card."""
+    return {
+        "summonerName": player.get("summonerName"),
+        "championName": player.get("championName"),
+        "portrait": get_champion_image_url(player.get("championName", "Unknown")),
+        "scores": [player["scores"].get(key, 0) for key in ("kills", "deaths", "assists", "creepScore")],
+        "gold": round(player.get("calculated_gold", 0)),
+        "items": [
+            [item.get("slot"), *item_info(item)]
+            for item in player.get("items", []) if isinstance(item, dict)
+        ],
+    }
 
-        model_input = prepare_model_input(player_data, team_order_gold, team_chaos_gold)
-        game_time_minutes = game_time / 60
-        predictions = predict_win_probability(model_input,game_time_minutes)
 
-        with chart_placeholder.container():
-            create_win_probability_chart(predictions, chart_type)
+if __name__ == "__main__":
+    st.set_page_config(layout="wide")
+    st.title("League of Legends Win Prediction")
+    # Static styles go out once per run instead of with every summary render
+    st.markdown(SUMMARY_CSS, unsafe_allow_html=True)
+
+    if metrics_port:
+        start_metrics_server(metrics_port)
+
+    if 'win_history' not in st.session_state:
+        st.session_state.win_history = WinHistory()
+        # EventLog game the chart belongs to; a different one starts it over
+        st.session_state.chart_game = None
+    if not len(st.session_state.win_history):
+        # Viewers who join mid-game get the whole curve so far
+        fetch_history()
+
+    if 'wire_snapshot' not in st.session_state:
+        st.session_state.wire_snapshot = None
+
+    if 'assets' not in st.session_state:
+        st.session_state.assets = {'champions': {}, 'items': {}}
+        st.session_state.assets_fetched_at = float('-inf')
+
+    if 'event_cursor' not in st.session_state:
+        st.session_state.event_cursor = -1
+        st.session_state.event_game = None
+        st.session_state.event_gold = {}
+        st.session_state.event_assists = {}
+
+    win_prob_tab, teams_tab, summary_tab = st.tabs(["Win Probability", "Team Details", "Game Summary"])
+
+    with win_prob_tab:
+        chart_type = st.radio("Select Chart Type", ["Bar Chart", "Line Chart"], horizontal=True)
+        chart_placeholder = st.empty()
+        st.markdown("### Team Statistics")
+        stats_columns = dict(zip(("ORDER", "CHAOS"), st.columns(2)))
+        team_stats_placeholders = {team: column.empty() for team, column in stats_columns.items()}
+
+    with teams_tab:
+        team_columns = dict(zip(("ORDER", "CHAOS"), st.columns(2)))
+        team_columns["ORDER"].markdown("### Team Order")
+        team_columns["CHAOS"].markdown("### Team Chaos")
+        # One placeholder per player card, added as players appear
+        card_placeholders = {"ORDER": [], "CHAOS": []}
+
+    with summary_tab:
+        summary_placeholder = st.empty()
+        summary_data = fetch_summary()
+        if summary_data:
+            with summary_placeholder.container():
+                st.write("### Game Summary")
+                for key, value in summary_data.items():
+                    st.markdown(f"""
+                        **{key}**  
+                        {value}
+                        ___
+                    """)
+
+    # Skips Streamlit calls for components whose input has not changed
+    renderer = Renderer()
+    # Line chart elements drawn in this run, appended to as points arrive
+    line_chart = {}
+    summary_fetched_at = time.monotonic()
+    for data in stream_data():
+        if time.monotonic() - summary_fetched_at >= summary_interval:
+            summary_data = fetch_summary()
+            summary_fetched_at = time.monotonic()
+        if data:
+            fold_snapshot_events(data)
+            # Copied so the per-tick fields below never leak into the held snapshot
+            player_data = [dict(p) for p in data.get("player_data", [])]
+            game_stats = data.get("game_stats", {})
+            game_time = game_stats.get("gameTime", 0)
+
+            with stage_seconds.time(stage="features"):
+                model_input, player_gold = snapshot_features(
+                    player_data, game_time, event_gold=st.session_state.event_gold
+                )
 
-        with team_stats_placeholder.container():
-            st.markdown("### Team Statistics")
-            col1, col2 = st.columns(2)
+            for player, gold in zip(player_data, player_gold):
+                player['calculated_gold'] = float(gold)
 
-            with col1:
-                order_k, order_d, order_a = display_team_stats(
-                    team_order_players, "Team Order", team_order_gold
-                )
+                if not isinstance(player.get('items'), list):
+                    player['items'] = []
 
-            with col2:
-                chaos_k, chaos_d, chaos_a = display_team_stats(
-                    team_chaos_players, "Team Chaos", team_chaos_gold
-                )
+                if player['items']:
+                    player['items'] = sorted(player['items'],
+                    key=lambda x: x.get('slot', 0) if isinstance(x, dict) else 0)
 
-        with team_details_placeholder.container():
-            col1, col2 = st.columns(2)
+            fetch_assets(player_data)
 
-            with col1:
-                st.markdown("### Team Order")
-                for player in team_order_players:
-                    display_player_card(player)
+            team_order_players = [p for p in player_data if p["team"] == "ORDER"]
+            team_chaos_players = [p for p in player_data if p["team"] == "CHAOS"]
 
-            with col2:
-                st.markdown("### Team Chaos")
-                for player in team_chaos_players:
-                    display_player_card(player)
+            team_order_gold = model_input[3]
+            team_chaos_gold = model_input[9]
 
-        with summary_placeholder.container():
-            if summary_data:
-                st.markdown("""
-                    <style>
-                        .card-grid {
-                            display: grid;
-                            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-                            gap: 1.5rem;
-                            padding: 1rem;
-                        }
-                        .summary-card {
-                            background: white;
-                            padding: 1.5rem;
-                            border-radius: 10px;
-                            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                            transition: transform 0.2s;
-                        }
-                        .summary-card:hover {
-                            transform: translateY(-2px);
-                            box-shadow: 0 6px 8px rgba(0,0,0,0.15);
-                        }
-                        .card-title {
-                            font-size: 1.25rem;
-                            font-weight: 600;
-                            color: #3b82f6;
-                            margin-bottom: 1rem;
-                            padding-bottom: 0.5rem;
-                            border-bottom: 2px solid #e5e7eb;
-                        }
-                        .card-content {
-                            color: #4b5563;
-                            line-height: 1.6;
-                            white-space: pre-line;
-                        }
-                    </style>
-                    <div class="card-grid">
-                """, unsafe_allow_html=True)
+            chart_game = data.get("event_game_id")
+            if chart_game is not None and chart_game != st.session_state.chart_game:
+                if st.session_state.chart_game is not None:
+                    st.session_state.win_history.reset()
+                st.session_state.chart_game = chart_game
 
-                for key, value in summary_data.items():
-                    st.markdown(f"""
-                        <div class="summary-card">
-                            <div class="card-title">{key}</div>
-                            <div class="card-content">{value}</div>
-                        </div>
-                    """, unsafe_allow_html=True)
+            game_time_minutes = game_time / 60
+            predictions = predict_win_probability(model_input,game_time_minutes)
+
+            if chart_type == "Line Chart":
+                update_line_chart(chart_placeholder, line_chart, predictions, game_time)
+            else:
+                renderer.render(
+                    "chart", chart_placeholder, [chart_type, game_time, predictions],
+                    lambda: create_win_probability_chart(predictions, chart_type, game_time)
+                )
+
+            teams = {
+                "ORDER": ("Team Order", team_order_players, team_order_gold),
+                "CHAOS": ("Team Chaos", team_chaos_players, team_chaos_gold),
+            }
+            for team, (team_name, players, team_gold) in teams.items():
+                renderer.render(
+                    ("stats", team), team_stats_placeholders[team],
+                    [round(float(team_gold)), [player_card_input(p)["scores"] for p in players]],
+                    lambda: display_team_stats(players, team_name, team_gold)
+                )
+
+                placeholders = card_placeholders[team]
+                while len(placeholders) < len(players):
+                    placeholders.append(team_columns[team].empty())
+                for index, placeholder in enumerate(placeholders):
+                    if index < len(players):
+                        player = players[index]
+                        renderer.render(
+                            ("card", team, index), placeholder, player_card_input(player),
+                            lambda: display_player_card(player)
+                        )
+                    else:
+                        renderer.clear(("card", team, index), placeholder)
+
+            if summary_data:
+                renderer.render(
+                    "summary", summary_placeholder, summary_data,
+                    lambda: display_summary_cards(summary_data)
+                )
 
-                st.markdown('</div>', unsafe_allow_html=True)
+        else:
+            st.write("Waiting for data...")
 
-    else:
-        st.write("Waiting for data...")
-    time.sleep(5)
\ No newline at end of file
+        if script_start is not None:
+            print(f"First render in {time.perf_counter() - script_start:.3f}s")
+            script_start = None
\ No newline at end of file
@@ -0,0 +1,186 @@
+"""Local store of champion portraits and item metadata, served with content-hashed URLs.
+
+Portraits live in <directory>/champions/<Champion>.<ext> and item metadata in
+<directory>/items.json. Anything missing is fetched once from
+CommunityDragon, unless the store is offline, in which case a pre-populated
+directory is used as is. Item names and prices are also learned from the
+Live Client payloads, so snapshots can be sent on with item IDs only.
+"""
+import hashlib
+import json
+import os
+import threading
+
+CDN_URL = "https://cdn.communitydragon.org/latest"
+ITEMS_URL = "https://raw.communitydragon.org/latest/plugins/rcp-be-lol-game-data/global/default/v1/items.json"
+
+# Live Client champion names whose CommunityDragon key differs
+NAME_CORRECTIONS = {
+    "Nunu & Willump": "Nunu",
+    "Renata Glasc": "Renata",
+    "Wukong": "MonkeyKing",
+}
+
+CONTENT_TYPES = {"png": "image/png", "jpg": "image/jpeg", "webp": "image/webp"}
+
+
+def champion_key(champion_name):
+    """CommunityDragon key for a Live Client champion name, e.g. "Kai'Sa" -> "KaiSa"."""
+    champion_name = NAME_CORRECTIONS.get(champion_name, champion_name)
+    return champion_name.replace(" ", "").replace("'", "").replace(".", "")
+
+
+def image_extension(data):
+    """File extension for PNG, JPEG or WebP bytes, or None."""
+    if data.startswith(b"\x89PNG"):
+        return "png"
+    if data.startswith(b"\xff\xd8"):
+        return "jpg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def item_ids(player_data):
+    """Copy of player_data with each item reduced to its itemID and slot."""
+    players = []
+    for player in player_data if isinstance(player_data, list) else []:
+        if isinstance(player, dict) and isinstance(player.get("items"), list):
+            player = dict(player, items=[
+                {"itemID": item.get("itemID"), "slot": item.get("slot")}
+                for item in player["items"] if isinstance(item, dict)
+            ])
+        players.append(player)
+    return players
+
+
+class AssetStore:
+    """Portraits and item metadata kept in memory and on disk.
+
+    Portrait URLs carry a hash of the image bytes, so they can be cached by
+    browsers forever and change only when the image does.
+    """
+
+    def __init__(self, directory="assets", offline=False, session=None, timeout=(3.05, 10)):
+        self.directory = directory
+        self.offline = offline
+        self.session = session
+        self.timeout = timeout
+        self.portraits = {}
+        self.items = {}
+        self.items_fetched = False
+        self.fetched = 0
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        champions = os.path.join(self.directory, "champions")
+        if os.path.isdir(champions):
+            for filename in os.listdir(champions):
+                key, _, extension = filename.rpartition(".")
+                if extension in CONTENT_TYPES:
+                    with open(os.path.join(champions, filename), "rb") as f:
+                        self._add_portrait(key, f.read())
+
+        items_path = os.path.join(self.directory, "items.json")
+        if os.path.exists(items_path):
+            with open(items_path) as f:
+                self.items = json.load(f)
+            self.items_fetched = True
+
+    def _add_portrait(self, key, data):
+        extension = image_extension(data)
+        if extension is None:
+            return False
+        digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+        with self._lock:
+            self.portraits[key] = (digest, CONTENT_TYPES[extension], data)
+        return True
+
+    def _write(self, path, data):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"Error writing asset {path}: {e}")
+
+    def portrait_url(self, champion_name):
+        """Content-hashed path of a champion's portrait, or None until it is stored."""
+        key = champion_key(champion_name)
+        entry = self.portraits.get(key)
+        return f"/assets/champions/{key}.{entry[0]}" if entry else None
+
+    def portrait(self, key, digest):
+        """(digest, content type, bytes) of a stored portrait, or None."""
+        entry = self.portraits.get(key)
+        return entry if entry and entry[0] == digest else None
+
+    def learn_items(self, player_data):
+        """Record the names and prices of items seen in a Live Client player list."""
+        learned = False
+        with self._lock:
+            for player in player_data if isinstance(player_data, list) else []:
+                for item in player.get("items", []) if isinstance(player, dict) else []:
+                    if not isinstance(item, dict) or "displayName" not in item:
+                        continue
+                    info = {"name": item["displayName"], "price": item.get("price", 0)}
+                    if self.items.get(str(item.get("itemID"))) != info:
+                        self.items[str(item.get("itemID"))] = info
+                        learned = True
+            items = dict(self.items) if learned else None
+        if items is not None and not self.offline:
+            self._write(os.path.join(self.directory, "items.json"), json.dumps(items).encode())
+        return learned
+
+    def prefetch(self, champion_names):
+        """Fetch the portraits not stored yet, and the item list once; no-op offline."""
+        if self.offline or self.session is None:
+            return
+        with self._lock:
+            keys = {champion_key(name) for name in champion_names} - set(self.portraits) - self._pending
+            self._pending |= keys
+
+        for key in sorted(keys):
+            try:
+                response = self.session.get(f"{CDN_URL}/champion/{key}/portrait", timeout=self.timeout)
+                response.raise_for_status()
+                if self._add_portrait(key, response.content):
+                    self._write(
+                        os.path.join(self.directory, "champions", f"{key}.{image_extension(response.content)}"),
+                        response.content
+                    )
+                    self.fetched += 1
+            except Exception as e:
+                print(f"Error fetching portrait for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+        if not self.items_fetched:
+            self.items_fetched = True
+            try:
+                response = self.session.get(ITEMS_URL, timeout=self.timeout)
+                response.raise_for_status()
+                fetched = {
+                    str(item["id"]): {"name": item.get("name", ""), "price": item.get("priceTotal", 0)}
+                    for item in response.json() if isinstance(item, dict) and "id" in item
+                }
+            except Exception as e:
+                print(f"Error fetching item list: {e}")
+                return
+            with self._lock:
+                # Names learned from the Live Client take precedence
+                self.items = {**fetched, **self.items}
+                items = dict(self.items)
+            self._write(os.path.join(self.directory, "items.json"), json.dumps(items).encode())
+
+    def manifest(self):
+        """Portrait URLs by champion key and item metadata by item ID."""
+        with self._lock:
+            return {
+                "champions": {key: f"/assets/champions/{key}.{entry[0]}" for key, entry in self.portraits.items()},
+                "items": dict(self.items),
+            }
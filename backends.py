@@ -0,0 +1,288 @@
+"""Selectable CPU inference backends for the win-probability model.
+
+Every backend is a (features, game_times) -> [chaos, order] probabilities
+scorer, like make_scorer(), with its own intra-op thread limit:
+
+    torch-fp32  ComplexTabularModel as trained, the reference
+    torch-int8  dynamic int8 quantization of every Linear layer
+    torch-fp16  float16 weights and activations
+    torch-bf16  bfloat16 weights and activations
+    numpy       the fused float32 weights from model/fused.npz
+    onnx        the fused model on ONNX Runtime, when it is installed
+
+Run as a script to get an accuracy-parity report against torch-fp32 on
+held-out rows and a throughput benchmark at batch sizes 1 to 4096:
+
+    python backends.py --threads 1 --recording games/match.jsonl.gz --output backends.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+import numpy as np
+from scoring import LAYERS, FusedModel, temperature_softmax
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+BATCH_SIZES = [2 ** i for i in range(13)]
+
+
+class Backend:
+    """Scores feature rows with at most `threads` intra-op threads (None: library default)."""
+
+    name = None
+
+    def __init__(self, threads=None):
+        self.threads = threads
+
+    @contextmanager
+    def limit(self):
+        yield
+
+    def logits(self, features):
+        raise NotImplementedError
+
+    def __call__(self, features, game_times):
+        with self.limit():
+            logits = self.logits(np.asarray(features, dtype=np.float64).reshape(-1, 12))
+        return temperature_softmax(logits, game_times)
+
+
+class TorchBackend(Backend):
+    """ComplexTabularModel on torch, optionally quantized or cast to a lower precision."""
+
+    def __init__(self, name, threads=None, model_path="model/model.pth", scaler_path="model/scaler.pkl"):
+        super().__init__(threads)
+        import torch
+        import torch.nn as nn
+        from model import load_model
+
+        self.name = name
+        self.torch = torch
+        model, self.scaler = load_model(model_path, scaler_path)
+        self.dtype = torch.float32
+        if name == "torch-int8":
+            model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+        elif name == "torch-fp16":
+            self.dtype = torch.float16
+        elif name == "torch-bf16":
+            self.dtype = torch.bfloat16
+        elif name != "torch-fp32":
+            raise ValueError(f"Unknown torch backend: {name}")
+        self.model = model.to(self.dtype) if name != "torch-int8" else model
+        # StandardScaler.transform without sklearn's per-call validation
+        self.mean = self.scaler.mean_ if self.scaler.with_mean else 0.0
+        self.scale = self.scaler.scale_ if self.scaler.with_std else 1.0
+
+    @contextmanager
+    def limit(self):
+        if self.threads is None:
+            yield
+            return
+        # torch's thread count is process-wide, so restore it after the call
+        previous = self.torch.get_num_threads()
+        self.torch.set_num_threads(self.threads)
+        try:
+            yield
+        finally:
+            self.torch.set_num_threads(previous)
+
+    def logits(self, features):
+        scaled = self.torch.tensor((features - self.mean) / self.scale, dtype=self.dtype)
+        with self.torch.no_grad():
+            return self.model(scaled).float().numpy()
+
+
+class NumpyBackend(Backend):
+    """The fused float32 model on NumPy's BLAS."""
+
+    name = "numpy"
+
+    def __init__(self, threads=None, fused_path="model/fused.npz"):
+        super().__init__(threads)
+        self.model = FusedModel.load(fused_path)
+        self.controller = None
+        if threads is not None:
+            # Discovering the BLAS libraries is the slow part, so do it once
+            from threadpoolctl import ThreadpoolController
+            self.controller = ThreadpoolController()
+
+    @contextmanager
+    def limit(self):
+        if self.controller is None:
+            yield
+            return
+        with self.controller.limit(limits=self.threads):
+            yield
+
+    def logits(self, features):
+        return self.model.logits(features)
+
+
+def fused_onnx(weights):
+    """Serialize the fused model as an ONNX graph of MatMul, Add and LeakyRelu."""
+    from onnx import TensorProto, helper, numpy_helper
+
+    nodes, initializers = [], []
+
+    def dense(name, x, activate=True):
+        initializers.append(numpy_helper.from_array(weights[f"{name}_weight"], f"{name}_weight"))
+        initializers.append(numpy_helper.from_array(weights[f"{name}_bias"], f"{name}_bias"))
+        nodes.append(helper.make_node("MatMul", [x, f"{name}_weight"], [f"{name}_mm"]))
+        nodes.append(helper.make_node("Add", [f"{name}_mm", f"{name}_bias"], [f"{name}_out"]))
+        if not activate:
+            return f"{name}_out"
+        nodes.append(helper.make_node("LeakyRelu", [f"{name}_out"], [f"{name}_act"], alpha=0.01))
+        return f"{name}_act"
+
+    x = "features"
+    for name in LAYERS[:4]:
+        x = dense(name, x)
+    nodes.append(helper.make_node("Add", [x, dense("residual", x)], ["residual_sum"]))
+    output = dense("output", "residual_sum", activate=False)
+
+    graph = helper.make_graph(
+        nodes, "fused_win_model",
+        [helper.make_tensor_value_info("features", TensorProto.FLOAT, [None, 12])],
+        [helper.make_tensor_value_info(output, TensorProto.FLOAT, [None, 2])],
+        initializers
+    )
+    # IR version 8 loads on every ONNX Runtime release since 1.10
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)], ir_version=8)
+    return model.SerializeToString()
+
+
+class OnnxBackend(Backend):
+    """The fused model on ONNX Runtime's CPU provider."""
+
+    name = "onnx"
+
+    def __init__(self, threads=None, fused_path="model/fused.npz"):
+        super().__init__(threads)
+        if onnxruntime is None:
+            raise ImportError("onnxruntime is not installed")
+        with np.load(fused_path) as weights:
+            graph = fused_onnx(dict(weights))
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads or 0
+        options.inter_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(graph, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def logits(self, features):
+        return self.session.run(None, {self.input_name: features.astype(np.float32)})[0]
+
+
+BACKENDS = ["torch-fp32", "torch-int8", "torch-fp16", "torch-bf16", "numpy", "onnx"]
+
+
+def make_backend(name, threads=None, fused_path="model/fused.npz"):
+    """Build one of BACKENDS by name."""
+    if name.startswith("torch-"):
+        return TorchBackend(name, threads)
+    if name == "numpy":
+        return NumpyBackend(threads, fused_path)
+    if name == "onnx":
+        return OnnxBackend(threads, fused_path)
+    raise ValueError(f"Unknown backend {name!r}; choose from {', '.join(BACKENDS)}")
+
+
+def held_out_rows(recordings, rows=5000, seed=1):
+    """Feature rows and game times to check parity on.
+
+    Ticks from replay.py recordings when given; otherwise rows drawn around
+    the scaler's training statistics, with a seed the fusion check in
+    model.py does not use.
+    """
+    if recordings:
+        from features import padded_features
+        from score import iter_ticks
+        ticks = [tick for path in recordings for tick in iter_ticks(path)]
+        features, _ = padded_features([tick[3] for tick in ticks], [tick[2] for tick in ticks])
+        return features, np.array([tick[2] / 60 for tick in ticks])
+
+    import joblib
+    scaler = joblib.load("model/scaler.pkl")
+    rng = np.random.default_rng(seed)
+    return np.abs(rng.normal(scaler.mean_, scaler.scale_, size=(rows, 12))), rng.uniform(0, 40, size=rows)
+
+
+def parity(reference, candidate):
+    """How far a backend's probabilities are from the reference, in percentage points."""
+    diff = np.abs(reference - candidate)[:, 1] * 100
+    return {
+        "max_abs_diff_pct": float(diff.max()),
+        "mean_abs_diff_pct": float(diff.mean()),
+        "p99_abs_diff_pct": float(np.percentile(diff, 99)),
+        "same_favourite_pct": float(np.mean(reference.argmax(axis=1) == candidate.argmax(axis=1)) * 100),
+    }
+
+
+def throughput(backend, features, game_times, batch_sizes=BATCH_SIZES, min_seconds=0.2):
+    """Rows per second and mean call latency at each batch size."""
+    results = {}
+    for size in batch_sizes:
+        batch = np.resize(features, (size, 12))
+        times = np.resize(game_times, size)
+        backend(batch, times)
+        calls, start = 0, time.perf_counter()
+        while calls < 3 or time.perf_counter() - start < min_seconds:
+            backend(batch, times)
+            calls += 1
+        elapsed = time.perf_counter() - start
+        results[size] = {"rows_per_s": size * calls / elapsed, "latency_us": elapsed / calls * 1e6}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=BACKENDS, choices=BACKENDS)
+    parser.add_argument("--threads", type=int, default=1, help="intra-op threads per backend")
+    parser.add_argument("--recording", nargs="*", default=[], help="replay.py recordings for held-out rows")
+    parser.add_argument("--min-seconds", type=float, default=0.2, help="time spent per batch size")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    features, game_times = held_out_rows(args.recording)
+    reference = make_backend("torch-fp32")(features, game_times)
+
+    results = {}
+    for name in args.backends:
+        try:
+            backend = make_backend(name, threads=args.threads)
+        except ImportError as e:
+            print(f"Skipping {name}: {e}", file=sys.stderr)
+            continue
+        results[name] = {
+            "parity": parity(reference, backend(features, game_times)),
+            "throughput": throughput(backend, features, game_times, min_seconds=args.min_seconds),
+        }
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "threads": args.threads,
+            "held_out_rows": len(features),
+            "source": args.recording or "synthetic",
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
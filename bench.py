@@ -0,0 +1,230 @@
+"""Benchmarks for the fetch -> feature -> predict -> render pipeline.
+
+Runs every stage against synthetic 10-player snapshots at early-, mid- and
+late-game event counts, or against frames of a recording from replay.py,
+and prints per-stage latency percentiles, throughput and peak allocations
+as JSON. Everything runs offline: the Live Client is served by the replay
+mock server on a local port and the LLM is a stub.
+
+    python bench.py --iterations 200 --output bench.json
+    python bench.py --recording games/match.jsonl.gz
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import numpy as np
+from werkzeug.serving import make_server
+from replay import Replay, create_mock_app, read_recording
+
+# (event count, game time in seconds) per game phase
+PHASES = {
+    "early": (10, 300.0),
+    "mid": (150, 1200.0),
+    "late": (600, 2400.0),
+}
+
+CHAMPIONS = ["Ahri", "Garen", "Lux", "Jinx", "Thresh", "Darius", "Ezreal", "Leona", "Yasuo", "Lee Sin"]
+EVENT_NAMES = ["ChampionKill", "DragonKill", "BaronKill", "TurretKilled", "Multikill", "FirstBlood"]
+
+
+def synthetic_snapshot(events, game_time, seed=0):
+    """Build a plausible /data snapshot with ten players and `events` events."""
+    rng = random.Random(seed)
+    names = [f"Player{i}" for i in range(10)]
+    players = []
+    for i, name in enumerate(names):
+        players.append({
+            "summonerName": f"{name}#EUW",
+            "championName": CHAMPIONS[i],
+            "team": "ORDER" if i < 5 else "CHAOS",
+            "level": min(18, 1 + int(game_time // 120)),
+            "scores": {
+                "kills": rng.randint(0, events // 20 + 1),
+                "deaths": rng.randint(0, events // 20 + 1),
+                "assists": rng.randint(0, events // 10 + 1),
+                "creepScore": int(game_time / 60 * rng.uniform(2, 8)),
+                "wardScore": round(rng.uniform(0, game_time / 60), 2),
+            },
+            "items": [
+                {"itemID": 1000 + slot, "slot": slot, "displayName": f"Item {slot}", "price": 300 * (slot + 1)}
+                for slot in range(min(7, int(game_time // 300) + 1))
+            ],
+        })
+
+    event_list = [{"EventID": 0, "EventName": "GameStart", "EventTime": 0.0}]
+    for event_id in range(1, events):
+        event_list.append({
+            "EventID": event_id,
+            "EventName": rng.choice(EVENT_NAMES),
+            "EventTime": game_time * event_id / events,
+            "KillerName": rng.choice(names),
+            "Assisters": rng.sample(names, rng.randint(0, 4)),
+        })
+
+    return {
+        "player_data": players,
+        "game_stats": {"gameTime": game_time, "gameMode": "CLASSIC"},
+        "event_data": event_list,
+    }
+
+
+def event_count(event_data):
+    if isinstance(event_data, dict):
+        return len(event_data.get("Events", []))
+    return len(event_data) if isinstance(event_data, list) else 0
+
+
+def recorded_snapshots(path):
+    """Pick frames at 25%, 50% and 100% of a recording as early/mid/late."""
+    frames = [snapshot for _, snapshot in read_recording(path)]
+    picks = {"early": len(frames) // 4, "mid": len(frames) // 2, "late": len(frames) - 1}
+    return {phase: {k: v for k, v in frames[index].items() if k != "version"} for phase, index in picks.items()}
+
+
+def measure(fn, iterations, warmup=5, ops=1):
+    """Time fn() and report latency percentiles, throughput and peak allocation.
+
+    ops is how many items one call processes, for batch throughput.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter_ns()
+        fn()
+        samples[i] = time.perf_counter_ns() - start
+    samples /= 1000
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "mean_us": float(samples.mean()),
+        "p50_us": float(np.percentile(samples, 50)),
+        "p90_us": float(np.percentile(samples, 90)),
+        "p99_us": float(np.percentile(samples, 99)),
+        "max_us": float(samples.max()),
+        "ops_per_s": float(ops * 1e6 / samples.mean()),
+        "peak_alloc_kib": peak / 1024,
+    }
+
+
+def serve_snapshot(snapshot):
+    """Serve a fixed snapshot from the mock Live Client on a free local port."""
+    server = make_server("127.0.0.1", 0, create_mock_app(Replay([(0.0, snapshot)])), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(snapshots, iterations):
+    # send.py reads the Live Client URL at import, so start the mock first
+    mock_snapshot = dict(snapshots["early"])
+    server = serve_snapshot(mock_snapshot)
+    os.environ["LIVE_CLIENT_URL"] = f"http://127.0.0.1:{server.server_port}"
+    # Keep the synthetic item names and champions out of the real asset
+    # store, and never reach for the CDN
+    os.environ["ASSET_OFFLINE"] = "1"
+    os.environ["ASSET_DIR"] = tempfile.mkdtemp(prefix="bench-assets-")
+
+    import streamlit as st
+    import app
+    import send
+    from features import batch_features, snapshot_features
+    from history import WinHistory
+    from scoring import FusedModel
+
+    send.default_game.summaries.summarize = lambda limited_data: "Stub summary."
+    # Every /data request fetches and records: no fresh or stale cache hits
+    send.default_game.cache.ttl = 0
+    send.default_game.cache.stale_ttl = 0
+    data_client = send.app.test_client()
+    fused = FusedModel.load(app.fused_path)
+    try:
+        from model import load_model, win_probabilities
+        model, scaler = load_model()
+    except ImportError:
+        model = None
+
+    st.session_state.assets = {"champions": {}, "items": {}}
+
+    results = {}
+    for phase, snapshot in snapshots.items():
+        mock_snapshot.clear()
+        mock_snapshot.update(snapshot)
+        player_data = snapshot["player_data"]
+        game_time = snapshot["game_stats"].get("gameTime", 0)
+        model_input, player_gold = snapshot_features(player_data, game_time, snapshot["event_data"])
+        batch = [snapshot] * 256
+        predictions = app.predict_win_probability(model_input, game_time / 60)
+        card_player = dict(player_data[0], calculated_gold=float(player_gold[0]))
+
+        stages = {
+            "fetch_snapshot": lambda: send.fetch_snapshot(),
+            "data_endpoint": lambda: data_client.get("/data", headers={"Accept-Encoding": "gzip"}),
+            "summary_input": lambda: send.summary_input(snapshot),
+            "features": lambda: snapshot_features(player_data, game_time, snapshot["event_data"]),
+            "predict_fused": lambda: fused.win_probabilities([model_input], [game_time / 60]),
+            "predict_app": lambda: app.predict_win_probability(model_input, game_time / 60),
+            "render_chart": lambda: app.create_win_probability_chart(predictions, "Line Chart"),
+            "render_player_card": lambda: app.display_player_card(card_player),
+        }
+        if model is not None:
+            stages["predict_torch"] = lambda: win_probabilities(model, scaler, [model_input], [game_time / 60])
+
+        results[phase] = {}
+        for name, fn in stages.items():
+            st.session_state.win_history = WinHistory()
+            results[phase][name] = measure(fn, iterations)
+        results[phase]["features_batch_256"] = measure(
+            lambda: batch_features(batch), max(iterations // 10, 5), ops=len(batch)
+        )
+
+    server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--recording", help="replay.py recording to take snapshots from")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    if args.recording:
+        snapshots = recorded_snapshots(args.recording)
+    else:
+        snapshots = {phase: synthetic_snapshot(*shape) for phase, shape in PHASES.items()}
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "source": args.recording or "synthetic",
+            "events": {phase: event_count(s["event_data"]) for phase, s in snapshots.items()},
+        },
+        "results": run(snapshots, args.iterations),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
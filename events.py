@@ -0,0 +1,56 @@
+"""Per-game log of Live Client events, shared by send.py and the offline tools."""
+import bisect
+import threading
+
+
+class EventLog:
+    """Per-game log of Live Client events keyed by EventID.
+
+    The eventdata endpoint always returns the full history, so only events
+    past the last seen EventID are appended. A new game is detected when
+    gameTime goes backwards or the EventIDs restart.
+    """
+
+    def __init__(self):
+        self.game_id = 0
+        self.events = []
+        self.event_ids = []
+        self.game_time = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def last_id(self):
+        return self.event_ids[-1] if self.event_ids else -1
+
+    def ingest(self, snapshot):
+        events = snapshot.get("event_data", [])
+        if isinstance(events, dict):
+            events = events.get("Events", [])
+        events = [e for e in events if isinstance(e, dict) and isinstance(e.get("EventID"), int)]
+        game_time = snapshot.get("game_stats", {}).get("gameTime")
+
+        with self._lock:
+            restarted = events and max(e["EventID"] for e in events) < self.last_id
+            if restarted or (game_time is not None and game_time < self.game_time):
+                self.game_id += 1
+                self.events = []
+                self.event_ids = []
+            if game_time is not None:
+                self.game_time = game_time
+
+            for event in events:
+                if event["EventID"] > self.last_id:
+                    self.events.append(event)
+                    self.event_ids.append(event["EventID"])
+
+    def since(self, since, game_id=None):
+        """Return events after `since`, or the whole log if the caller is on another game."""
+        with self._lock:
+            if game_id != self.game_id:
+                since = -1
+            start = bisect.bisect_right(self.event_ids, since)
+            return {
+                "game_id": self.game_id,
+                "last_id": self.last_id,
+                "events": self.events[start:]
+            }
@@ -0,0 +1,182 @@
+"""Vectorized gold and model-feature computation for Live Client snapshots.
+
+Produces the same 12-column input that the model was trained on:
+
+    ORDER kills, deaths, assists, gold, cs, kda,
+    CHAOS kills, deaths, assists, gold, cs, kda
+"""
+import numpy as np
+
+STARTING_GOLD = 500
+PASSIVE_GOLD_START = 110
+PASSIVE_GOLD_PER_10_SECONDS = 20.4
+MINION_GOLD = 14
+WARD_GOLD = 30
+
+# Gold awarded to the killer and to each assister, by event type
+EVENT_GOLD = {
+    "DragonKill": (300, 100),
+    "BaronKill": (500, 200),
+    "TurretKilled": (250, 0),
+    "ChampionKill": (300, 0),
+}
+
+# Lookup tables indexed by event code; the last code is every other event
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_GOLD)}
+KILLER_GOLD = np.array([gold[0] for gold in EVENT_GOLD.values()] + [0], dtype=np.int64)
+ASSIST_GOLD = np.array([gold[1] for gold in EVENT_GOLD.values()] + [0], dtype=np.int64)
+
+TEAMS = {"ORDER": 1, "CHAOS": 2}
+TEAM_CODES = np.array([TEAMS["ORDER"], TEAMS["CHAOS"]], dtype=np.int8)
+
+# Columns of the per-player score matrix
+KILLS, DEATHS, ASSISTS, CREEP_SCORE, WARD_SCORE = range(5)
+SCORE_KEYS = ("kills", "deaths", "assists", "creepScore", "wardScore")
+
+
+def fold_events(events, event_gold, event_assists):
+    """Add the gold and assists from new events to the per-player tallies."""
+    for event in events:
+        if not isinstance(event, dict):
+            continue
+        killer_gold, assist_gold = EVENT_GOLD.get(event.get("EventName"), (0, 0))
+        killer = event.get("KillerName")
+        if killer_gold:
+            event_gold[killer] = event_gold.get(killer, 0) + killer_gold
+
+        for assister in event.get("Assisters", []):
+            if assister == killer:
+                continue
+            event_assists[assister] = event_assists.get(assister, 0) + 1
+            if assist_gold:
+                event_gold[assister] = event_gold.get(assister, 0) + assist_gold
+
+
+def base_name(summoner_name):
+    return summoner_name.split("#")[0]
+
+
+def event_gold_from_events(names, event_data):
+    """Gold each player earned from events, as a (players,) array."""
+    events = [e for e in event_data if isinstance(e, dict)] if event_data else []
+    if not events or not names:
+        return np.zeros(len(names), dtype=np.int64)
+
+    # Tally per distinct name, then spread to every column with that name
+    index = {}
+    columns = np.array([index.setdefault(name, len(index)) for name in names])
+
+    killers, killer_codes, assisters, assist_codes = [], [], [], []
+    for event in events:
+        code = EVENT_CODES.get(event.get("EventName"))
+        if code is None:
+            continue
+        killer = event.get("KillerName")
+        if killer in index:
+            killers.append(index[killer])
+            killer_codes.append(code)
+        if ASSIST_GOLD[code]:
+            for assister in set(event.get("Assisters", [])):
+                if assister != killer and assister in index:
+                    assisters.append(index[assister])
+                    assist_codes.append(code)
+
+    gold = (
+        np.bincount(np.array(killers, dtype=np.int64), KILLER_GOLD[killer_codes], minlength=len(index))
+        + np.bincount(np.array(assisters, dtype=np.int64), ASSIST_GOLD[assist_codes], minlength=len(index))
+    )
+    return gold.astype(np.int64)[columns]
+
+
+def snapshot_arrays(player_data, event_data=None, event_gold=None):
+    """Convert one snapshot into (teams, scores, event_gold) arrays.
+
+    event_gold may be a {base name: gold} tally kept incrementally; otherwise
+    it is computed from event_data.
+    """
+    players = player_data if isinstance(player_data, list) else []
+    names = [base_name(p.get("summonerName", "")) for p in players]
+
+    teams = np.array([TEAMS.get(p.get("team"), 0) for p in players], dtype=np.int8)
+    scores = np.array(
+        [[p["scores"].get(key, 0) for key in SCORE_KEYS] for p in players],
+        dtype=np.float64
+    ).reshape(len(players), len(SCORE_KEYS))
+
+    if event_gold is None:
+        gold = event_gold_from_events(names, event_data)
+    else:
+        gold = np.array([event_gold.get(name, 0) for name in names], dtype=np.int64)
+    return teams, scores, gold
+
+
+def compute_features(teams, scores, game_time, event_gold):
+    """Compute model features and player gold for a batch of padded snapshots.
+
+    teams (N, P), scores (N, P, 5), game_time (N,) and event_gold (N, P).
+    Returns features (N, 12) and per-player gold (N, P).
+    """
+    game_time = np.asarray(game_time, dtype=np.float64)
+    passive_gold = np.where(
+        game_time >= PASSIVE_GOLD_START,
+        ((game_time - PASSIVE_GOLD_START) // 10) * PASSIVE_GOLD_PER_10_SECONDS,
+        0.0
+    )
+    gold = (
+        (STARTING_GOLD + passive_gold)[:, None]
+        + scores[..., CREEP_SCORE] * MINION_GOLD
+        + scores[..., WARD_SCORE] * WARD_GOLD
+        + event_gold
+    )
+
+    # kills, deaths, assists, gold, cs per player
+    stats = np.concatenate([scores[..., :CREEP_SCORE], gold[..., None], scores[..., CREEP_SCORE, None]], axis=-1)
+
+    # Both teams at once: (N, P, team, stat), summed over players; cumsum
+    # adds players in order, matching Python's sum() exactly
+    members = teams[..., None, None] == TEAM_CODES[:, None]
+    masked = np.where(members, stats[:, :, None, :], 0.0)
+    # No players (client loading or down) gives zero totals, as the loops did
+    totals = np.cumsum(masked, axis=1)[:, -1] if masked.shape[1] else masked.sum(axis=1)
+    kda = totals[..., KILLS] / np.maximum(totals[..., DEATHS], 1)
+    return np.concatenate([totals, kda[..., None]], axis=-1).reshape(len(totals), 12), gold
+
+
+def snapshot_features(player_data, game_time, event_data=None, event_gold=None):
+    """Return the 12-column model input and per-player gold for one snapshot."""
+    teams, scores, gold = snapshot_arrays(player_data, event_data, event_gold)
+    # A single snapshot needs no padding
+    features, player_gold = compute_features(teams[None], scores[None], [game_time], gold[None])
+    return features[0], player_gold[0]
+
+
+def batch_features(snapshots):
+    """Compute model features for many /data-style snapshots at once.
+
+    Returns features (N, 12) and per-player gold (N, P), zero past each
+    snapshot's player count.
+    """
+    arrays = [
+        snapshot_arrays(s.get("player_data", []), s.get("event_data", []))
+        for s in snapshots
+    ]
+    game_time = [s.get("game_stats", {}).get("gameTime", 0) for s in snapshots]
+    return padded_features(arrays, game_time)
+
+
+def padded_features(arrays, game_time):
+    """Pad per-snapshot arrays to a common player count and compute features."""
+    width = max([len(teams) for teams, _, _ in arrays] + [1])
+    teams = np.zeros((len(arrays), width), dtype=np.int8)
+    scores = np.zeros((len(arrays), width, len(SCORE_KEYS)), dtype=np.float64)
+    gold = np.zeros((len(arrays), width), dtype=np.int64)
+    present = np.zeros((len(arrays), width), dtype=bool)
+    for row, (snapshot_teams, snapshot_scores, snapshot_gold) in enumerate(arrays):
+        count = len(snapshot_teams)
+        teams[row, :count] = snapshot_teams
+        scores[row, :count] = snapshot_scores
+        gold[row, :count] = snapshot_gold
+        present[row, :count] = True
+
+    features, player_gold = compute_features(teams, scores, game_time, gold)
+    return features, np.where(present, player_gold, 0.0)
@@ -0,0 +1,102 @@
+"""Fixed-capacity win probability history for the dashboard chart.
+
+Points live in preallocated NumPy arrays. When the buffer fills, the older
+part is thinned with min/max buckets. The newest points stay at full
+resolution, and the swings in older parts of the game stay visible.
+"""
+import numpy as np
+
+
+class WinHistory:
+    """Ring of (game time, order win %, chaos win %) points for one game."""
+
+    def __init__(self, capacity=720, recent=240, new_game_gap=120.0):
+        if capacity - recent < 8:
+            raise ValueError("capacity must leave room to thin older points")
+        self.capacity = capacity
+        self.recent = recent
+        self.new_game_gap = new_game_gap
+        self._times = np.empty(capacity, dtype=np.float64)
+        self._values = np.empty((capacity, 2), dtype=np.float64)
+        self.size = 0
+        # Bumped whenever existing points change rather than new ones being
+        # appended, so a chart holding the old points knows to redraw
+        self.generation = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def times(self):
+        return self._times[:self.size]
+
+    @property
+    def order(self):
+        return self._values[:self.size, 0]
+
+    @property
+    def chaos(self):
+        return self._values[:self.size, 1]
+
+    def reset(self):
+        self.size = 0
+        self.generation += 1
+
+    def load(self, times, order, chaos):
+        """Replace the history with a backfilled series, oldest first."""
+        self.reset()
+        for point in zip(times, order, chaos):
+            self.append(*point)
+
+    def append(self, game_time, order_win, chaos_win):
+        """Add a point.
+
+        A point up to new_game_gap seconds earlier than the last one is a late
+        message and is dropped; one further back starts a new game. Callers
+        that know the game changed can also call reset().
+        """
+        if self.size:
+            last = self._times[self.size - 1]
+            if game_time < last:
+                if last - game_time < self.new_game_gap:
+                    return
+                self.reset()
+            elif game_time == last:
+                if tuple(self._values[self.size - 1]) != (order_win, chaos_win):
+                    self._values[self.size - 1] = (order_win, chaos_win)
+                    self.generation += 1
+                return
+        if self.size == self.capacity:
+            self._compact()
+        self._times[self.size] = game_time
+        self._values[self.size] = (order_win, chaos_win)
+        self.size += 1
+
+    def _compact(self):
+        """Thin the points older than the recent window to min/max per time bucket.
+
+        Buckets span equal game time, so early game keeps its share of the
+        chart however often the history is thinned.
+        """
+        old = self.size - self.recent
+        times = self._times[:old]
+        values = self._values[:old, 0]
+        buckets = (self.capacity - self.recent) // 4
+        span = max(times[-1] - times[0], 1e-9)
+        bucket = np.minimum(((times - times[0]) / span * buckets).astype(np.int64), buckets - 1)
+
+        # Sorted by bucket, then value: each bucket's first and last entries
+        # are its minimum and maximum
+        ranked = np.lexsort((values, bucket))
+        ranked_buckets = bucket[ranked]
+        first = np.flatnonzero(np.r_[True, ranked_buckets[1:] != ranked_buckets[:-1]])
+        last = np.r_[first[1:], old] - 1
+        keep = np.unique(np.concatenate([ranked[first], ranked[last]]))
+
+        kept = len(keep)
+        self._times[:kept] = self._times[keep]
+        self._values[:kept] = self._values[keep]
+        self._times[kept:kept + self.recent] = self._times[old:self.size]
+        self._values[kept:kept + self.recent] = self._values[old:self.size]
+        self.size = kept + self.recent
+        self.generation += 1
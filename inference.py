@@ -0,0 +1,154 @@
+"""Win-probability service shared by many concurrent games.
+
+Requests from every game are queued and scored together in micro-batches,
+so the model runs once per batch instead of once per viewer.
+
+POST /predict with {"features": [12 values], "game_time": minutes} or a
+list of those objects.
+"""
+import math
+import os
+import queue
+import threading
+import time
+from flask import Flask, jsonify, request
+from backends import make_backend
+
+app = Flask(__name__)
+
+
+class MicroBatcher:
+    """Collects rows from concurrent callers and scores them in one forward pass.
+
+    A batch is flushed once it holds max_batch rows or max_wait seconds have
+    passed since its first row arrived.
+    """
+
+    def __init__(self, predict, max_batch=256, max_wait=0.005):
+        self.predict = predict
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, rows):
+        """Score (features, game_time) rows, blocking until their batch is done."""
+        items = [
+            {"features": features, "game_time": game_time, "done": threading.Event(),
+             "result": None, "error": None}
+            for features, game_time in rows
+        ]
+        for item in items:
+            self._queue.put(item)
+        for item in items:
+            item["done"].wait()
+            if item["error"] is not None:
+                raise item["error"]
+        return [item["result"] for item in items]
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                results = self.predict(
+                    [item["features"] for item in batch],
+                    [item["game_time"] for item in batch]
+                )
+                for item, result in zip(batch, results):
+                    item["result"] = result
+            except Exception as e:
+                print(f"Error scoring batch of {len(batch)}: {e}")
+                for item in batch:
+                    item["error"] = e
+            finally:
+                self.batches += 1
+                self.rows += len(batch)
+                for item in batch:
+                    item["done"].set()
+
+
+# Optional backend from backends.py (torch-int8, torch-bf16, numpy, ...) and
+# its intra-op thread count; the fp32 torch model is used when unset
+scoring_backend = os.environ.get("SCORING_BACKEND")
+scoring_threads = int(os.environ.get("SCORING_THREADS", "0")) or None
+
+if scoring_backend:
+    score = make_backend(scoring_backend, threads=scoring_threads)
+else:
+    from model import load_model, win_probabilities
+
+    model, scaler = load_model()
+
+    def score(features, game_times):
+        return win_probabilities(model, scaler, features, game_times)
+
+
+def predict_rows(features, game_times):
+    probs = score(features, game_times)
+    return [
+        {"team_order_win": float(p[1] * 100), "team_chaos_win": float(p[0] * 100)}
+        for p in probs
+    ]
+
+
+batcher = MicroBatcher(
+    predict_rows,
+    max_batch=int(os.environ.get("MAX_BATCH", "256")),
+    max_wait=float(os.environ.get("MAX_WAIT_MS", "5")) / 1000
+)
+
+
+@app.route('/predict', methods=['POST'])
+def predict():
+    body = request.get_json(silent=True)
+    single = isinstance(body, dict)
+    rows = [body] if single else body
+    try:
+        if not isinstance(rows, list) or not rows:
+            raise ValueError("expected an object or a non-empty list of objects")
+        parsed = []
+        for row in rows:
+            features = [float(x) for x in row["features"]]
+            if len(features) != 12:
+                raise ValueError("features must have 12 values")
+            game_time = float(row.get("game_time", 0))
+            # NaN or infinite inputs would come back as NaN, which is not valid JSON
+            if not all(math.isfinite(x) for x in features + [game_time]):
+                raise ValueError("features and game_time must be finite numbers")
+            parsed.append((features, game_time))
+    except Exception as e:
+        return jsonify({"error": f"Invalid request: {e}"}), 400
+
+    try:
+        results = batcher.submit(parsed)
+    except Exception as e:
+        print(f"Error details: {str(e)}")
+        return jsonify({"error": "Failed to score request"}), 500
+    return jsonify(results[0] if single else results)
+
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    return jsonify({
+        "batches": batcher.batches,
+        "rows": batcher.rows,
+        "max_batch": batcher.max_batch,
+        "max_wait": batcher.max_wait
+    })
+
+
+if __name__ == "__main__":
+    app.run(host="0.0.0.0", port=5001, debug=False, threaded=True)
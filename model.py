@@ -1,5 +1,13 @@
+import argparse
+import sys
+import time
+import warnings
+import joblib
+import numpy as np
+import torch
 import torch.nn as nn
 import torch.nn.functional as F
+from scoring import LAYERS, FusedModel, time_based_temperature
 
 class ComplexTabularModel(nn.Module):
     def __init__(self, input_dim):
@@ -42,3 +50,143 @@ class ComplexTabularModel(nn.Module):
         x = self.output_layer(x)
         return x
 
+
+def load_model(model_path="model/model.pth", scaler_path="model/scaler.pkl"):
+    """Load the trained model in eval mode together with its input scaler."""
+    model = ComplexTabularModel(input_dim=12)
+    model.load_state_dict(torch.load(model_path))
+    model.eval()
+    return model, joblib.load(scaler_path)
+
+
+def win_probabilities(model, scaler, features, game_times):
+    """Return temperature-scaled [chaos, order] win probabilities for a batch.
+
+    features is (N, 12) and game_times holds each row's game time in minutes.
+    """
+    scaled_input = scaler.transform(np.asarray(features, dtype=np.float64).reshape(-1, 12))
+    input_tensor = torch.tensor(scaled_input, dtype=torch.float32)
+    temperature = torch.tensor(
+        [[time_based_temperature(t)] for t in game_times], dtype=torch.float32
+    ).reshape(-1, 1)
+    with torch.no_grad():
+        prediction = model(input_tensor)
+        probs = torch.softmax(prediction / temperature, dim=1)
+    return probs.numpy()
+
+
+def predict_win_probability(model, scaler, model_input, game_time):
+    """Score one row the way the dashboard originally did; the reference for parity checks."""
+    scaled_input = scaler.transform([model_input])
+    input_tensor = torch.tensor(scaled_input, dtype=torch.float32)
+    with torch.no_grad():
+        prediction = model(input_tensor)
+        temperature = time_based_temperature(game_time)
+        probs = torch.softmax(prediction / temperature, dim=1)
+    return {
+        "team_order_win": float(probs[0][1].item() * 100),
+        "team_chaos_win": float(probs[0][0].item() * 100),
+    }
+
+
+def _fold_linear(linear, batch_norm=None):
+    """Return (weight, bias) of a Linear layer with an eval-mode BatchNorm folded in."""
+    weight = linear.weight.detach().double().numpy()
+    bias = linear.bias.detach().double().numpy()
+    if batch_norm is not None:
+        scale = (batch_norm.weight.detach().double()
+                 / torch.sqrt(batch_norm.running_var.double() + batch_norm.eps)).numpy()
+        weight = weight * scale[:, None]
+        bias = (bias - batch_norm.running_mean.double().numpy()) * scale + batch_norm.bias.detach().double().numpy()
+    return weight, bias
+
+
+def _fold_sequential(block):
+    """Fold each Linear + BatchNorm1d pair of a block; activations and Dropout are implied."""
+    modules = list(block)
+    return [
+        _fold_linear(module, modules[i + 1] if isinstance(modules[i + 1], nn.BatchNorm1d) else None)
+        for i, module in enumerate(modules[:-1]) if isinstance(module, nn.Linear)
+    ]
+
+
+def fuse_model(model, scaler):
+    """Fold the scaler and every BatchNorm into the Linear layers.
+
+    Returns float32 weights for scoring.FusedModel, stored as (in, out)
+    matrices. Only valid for the eval-mode model.
+    """
+    weight, bias = _fold_linear(model.input_layer)
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(weight.shape[1])
+    scale = scaler.scale_ if scaler.with_std else np.ones(weight.shape[1])
+    bias = bias - weight @ (mean / scale)
+    weight = weight / scale
+
+    layers = [(weight, bias)]
+    layers += _fold_sequential(model.hidden_layers)
+    layers += _fold_sequential(model.residual_block)
+    layers.append(_fold_linear(model.output_layer))
+
+    weights = {}
+    for name, (weight, bias) in zip(LAYERS, layers):
+        weights[f"{name}_weight"] = weight.T.astype(np.float32)
+        weights[f"{name}_bias"] = bias.astype(np.float32)
+    return weights
+
+
+def compare_fused(model, scaler, fused, rows=2000, seed=0):
+    """Check the fused model against the original single-row torch path on synthetic rows.
+
+    Returns the largest probability difference in percentage points, against
+    both predict_win_probability and the batched win_probabilities, and the
+    mean single-row latency of each path in microseconds.
+    """
+    rng = np.random.default_rng(seed)
+    features = np.abs(rng.normal(scaler.mean_, scaler.scale_, size=(rows, 12)))
+    game_times = rng.uniform(0, 40, size=rows)
+
+    baseline = np.array([
+        [p["team_chaos_win"], p["team_order_win"]]
+        for p in (predict_win_probability(model, scaler, list(row), t) for row, t in zip(features, game_times))
+    ]) / 100
+    batched = win_probabilities(model, scaler, features, game_times)
+    candidate = fused.win_probabilities(features, game_times)
+
+    def latency(score):
+        start = time.perf_counter()
+        for row, game_time in zip(features[:200], game_times[:200]):
+            score([row], [game_time])
+        return (time.perf_counter() - start) / 200 * 1e6
+
+    return {
+        "max_abs_diff_pct": float(np.abs(baseline - candidate).max() * 100),
+        "batched_max_abs_diff_pct": float(np.abs(baseline - batched).max() * 100),
+        "torch_latency_us": latency(lambda f, t: win_probabilities(model, scaler, f, t)),
+        "fused_latency_us": latency(fused.win_probabilities),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export model/fused.npz and check it against the torch model")
+    parser.add_argument("--check", action="store_true", help="only check the existing model/fused.npz; write nothing")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="largest allowed difference in percentage points")
+    args = parser.parse_args()
+
+    model, scaler = load_model()
+    if args.check:
+        fused = FusedModel.load("model/fused.npz")
+    else:
+        weights = fuse_model(model, scaler)
+        np.savez("model/fused.npz", **weights)
+        print("Wrote model/fused.npz")
+        fused = FusedModel(weights)
+
+    with warnings.catch_warnings():
+        # The scaler was fitted on a DataFrame and warns on every plain array
+        warnings.simplefilter("ignore", UserWarning)
+        report = compare_fused(model, scaler, fused)
+    for key, value in report.items():
+        print(f"{key}: {value:.6f}")
+    if report["max_abs_diff_pct"] > args.tolerance:
+        print(f"Fused model differs from the torch model by more than {args.tolerance} pp")
+        sys.exit(1)
@@ -0,0 +1,48 @@
+"""Skip Streamlit re-renders for dashboard components whose data is unchanged."""
+import hashlib
+import json
+import metrics
+
+render_seconds = metrics.histogram(
+    "dashboard_render_seconds", "Time to draw one dashboard component", ["component"]
+)
+renders_skipped = metrics.counter(
+    "dashboard_renders_skipped", "Component renders skipped because their input was unchanged", ["component"]
+)
+
+
+def fingerprint(data):
+    """Stable digest of JSON-like component input."""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode(), digest_size=16).digest()
+
+
+class Renderer:
+    """Draws each placeholder again only when the fingerprint of its input changes.
+
+    Placeholders belong to one script run, so use one Renderer per run.
+    """
+
+    def __init__(self):
+        self._fingerprints = {}
+        self.drawn = 0
+        self.skipped = 0
+
+    def render(self, key, placeholder, data, draw):
+        """Call draw() inside placeholder if data differs from the last render of key."""
+        component = key[0] if isinstance(key, tuple) else key
+        digest = fingerprint(data)
+        if self._fingerprints.get(key) == digest:
+            self.skipped += 1
+            renders_skipped.inc(component=component)
+            return False
+        with render_seconds.time(component=component), placeholder.container():
+            draw()
+        self._fingerprints[key] = digest
+        self.drawn += 1
+        return True
+
+    def clear(self, key, placeholder):
+        """Empty placeholder if key was rendered, so it draws again next time."""
+        if self._fingerprints.pop(key, None) is not None:
+            placeholder.empty()
@@ -0,0 +1,175 @@
+"""Record Live Client sessions and replay them through a mock Live Client server.
+
+Recordings are JSON lines, gzip- or zstd-compressed by file extension
+(.gz, .zst). The first line holds a full snapshot and every later line a
+delta against the previous one (see wire.py), each stamped with "t", the
+seconds since recording started:
+
+    python replay.py record games/match.jsonl.gz
+    python replay.py serve games/match.jsonl.gz --speed 4
+
+Then run send.py with LIVE_CLIENT_URL=http://127.0.0.1:2999. Several
+recordings can be served at once on consecutive ports. --tls serves
+self-signed HTTPS like the real client, which needs the cryptography package.
+"""
+import argparse
+import bisect
+import gzip
+import io
+import json
+import threading
+import time
+from flask import Flask, jsonify
+from werkzeug.serving import make_server
+from wire import apply_delta, snapshot_delta
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SNAPSHOT_KEYS = ("player_data", "game_stats", "event_data")
+
+
+def open_recording(path, mode="r"):
+    """Open a recording for text reading or writing, compressed by extension."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required for .zst recordings")
+        return zstandard.open(path, mode + "t", encoding="utf-8")
+    return io.open(path, mode, encoding="utf-8")
+
+
+def record(path, fetch, interval=1.0, duration=None):
+    """Poll fetch() every interval seconds and append each changed snapshot to path."""
+    started = time.monotonic()
+    previous = None
+    frames = 0
+    with open_recording(path, "w") as recording:
+        try:
+            while duration is None or time.monotonic() - started < duration:
+                polled = time.monotonic()
+                polled_snapshot = fetch()
+                snapshot = {key: polled_snapshot.get(key) for key in SNAPSHOT_KEYS}
+                if previous is None or any(snapshot[key] != previous[key] for key in SNAPSHOT_KEYS):
+                    snapshot["version"] = frames
+                    frame = {"t": round(polled - started, 3)}
+                    if previous is None:
+                        frame["snapshot"] = snapshot
+                    else:
+                        frame["delta"] = snapshot_delta(previous, snapshot)
+                    recording.write(json.dumps(frame) + "\n")
+                    previous = snapshot
+                    frames += 1
+                time.sleep(max(0.0, interval - (time.monotonic() - polled)))
+        except KeyboardInterrupt:
+            pass
+    return frames
+
+
+def read_recording(path):
+    """Yield (t, snapshot) for every frame of a recording.
+
+    Lines holding a bare /data snapshot are accepted too, with t = None.
+    """
+    snapshot = None
+    with open_recording(path) as recording:
+        for line in recording:
+            frame = json.loads(line)
+            if "delta" in frame:
+                snapshot = apply_delta(snapshot, frame["delta"])
+            else:
+                snapshot = frame.get("snapshot", frame)
+            yield frame.get("t"), snapshot
+
+
+class Replay:
+    """Plays recorded frames back against the wall clock, optionally faster or looped."""
+
+    def __init__(self, frames, speed=1.0, loop=False):
+        self.times = [t for t, _ in frames]
+        self.snapshots = [snapshot for _, snapshot in frames]
+        self.speed = speed
+        self.loop = loop
+        self.started = time.monotonic()
+
+    def current(self):
+        elapsed = (time.monotonic() - self.started) * self.speed
+        if self.loop and self.times[-1] > 0:
+            elapsed %= self.times[-1] + 1
+        index = bisect.bisect_right(self.times, elapsed) - 1
+        return self.snapshots[max(index, 0)]
+
+
+def create_mock_app(replay):
+    """Flask app answering the three Live Client endpoints send.py uses."""
+    mock = Flask(__name__)
+
+    @mock.route('/liveclientdata/playerlist', methods=['GET'])
+    def playerlist():
+        return jsonify(replay.current().get("player_data", []))
+
+    @mock.route('/liveclientdata/gamestats', methods=['GET'])
+    def gamestats():
+        return jsonify(replay.current().get("game_stats", {}))
+
+    @mock.route('/liveclientdata/eventdata', methods=['GET'])
+    def eventdata():
+        return jsonify(replay.current().get("event_data", {}))
+
+    return mock
+
+
+def serve(paths, host="127.0.0.1", port=2999, speed=1.0, loop=False, tls=False):
+    """Serve each recording on its own port, starting at `port`, until interrupted."""
+    servers = []
+    for offset, path in enumerate(paths):
+        replay = Replay(list(read_recording(path)), speed=speed, loop=loop)
+        server = make_server(
+            host, port + offset, create_mock_app(replay), threaded=True,
+            ssl_context="adhoc" if tls else None
+        )
+        print(f"Replaying {path} on {'https' if tls else 'http'}://{host}:{port + offset} at {speed}x")
+        servers.append(server)
+
+    threads = [threading.Thread(target=server.serve_forever, daemon=True) for server in servers]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        for server in servers:
+            server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="record the local Live Client")
+    record_parser.add_argument("path")
+    record_parser.add_argument("--interval", type=float, default=1.0)
+    record_parser.add_argument("--duration", type=float, default=None)
+
+    serve_parser = commands.add_parser("serve", help="replay recordings as mock Live Clients")
+    serve_parser.add_argument("paths", nargs="+")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=2999)
+    serve_parser.add_argument("--speed", type=float, default=1.0)
+    serve_parser.add_argument("--loop", action="store_true")
+    serve_parser.add_argument("--tls", action="store_true", help="serve self-signed HTTPS (needs cryptography)")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        from send import fetch_snapshot
+        frames = record(args.path, fetch_snapshot, args.interval, args.duration)
+        print(f"Recorded {frames} frames to {args.path}")
+    else:
+        serve(args.paths, args.host, args.port, args.speed, args.loop, tls=args.tls)
+
+
+if __name__ == "__main__":
+    main()
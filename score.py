@@ -0,0 +1,166 @@
+"""Bulk offline win-probability scoring for recorded games.
+
+Streams snapshot files (replay.py recordings, or JSON lines of /data
+snapshots) through the same event tallies, feature engine and scorer as
+the live dashboard, in fixed-size batches, with one worker process per
+file. Each input gets a CSV or Parquet file of per-timestamp
+probabilities in the output directory:
+
+    python score.py games/*.jsonl.gz --output-dir scores --format parquet
+"""
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from events import EventLog
+from features import fold_events, padded_features, snapshot_arrays
+from replay import read_recording
+from scoring import make_scorer
+
+COLUMNS = [
+    "t", "game_id", "game_time", "team_order_gold", "team_chaos_gold",
+    "team_order_win", "team_chaos_win",
+]
+
+# Set per worker process by init_worker()
+scorer = None
+
+
+def init_worker(fused_path, backend=None, threads=1):
+    global scorer
+    try:
+        from threadpoolctl import threadpool_limits
+        # One BLAS thread per worker by default; the parallelism is across files
+        threadpool_limits(threads)
+    except ImportError:
+        pass
+    scorer = make_scorer(fused_path, backend=backend, threads=threads)
+
+
+def iter_ticks(path):
+    """Yield (t, game_id, game_time, arrays) per snapshot, as the dashboard sees it.
+
+    Event gold comes from the same EventLog deltas and running tallies the
+    dashboard keeps, so probabilities match the live view.
+    """
+    log = EventLog()
+    cursor, game_id = -1, None
+    event_gold, event_assists = {}, {}
+    for t, snapshot in read_recording(path):
+        log.ingest(snapshot)
+        delta = log.since(cursor, game_id)
+        if delta["game_id"] != game_id:
+            game_id = delta["game_id"]
+            event_gold, event_assists = {}, {}
+        fold_events(delta["events"], event_gold, event_assists)
+        cursor = delta["last_id"]
+
+        game_time = snapshot.get("game_stats", {}).get("gameTime", 0)
+        arrays = snapshot_arrays(snapshot.get("player_data", []), event_gold=event_gold)
+        yield t if t is not None else game_time, game_id, game_time, arrays
+
+
+def score_batch(batch):
+    """Score buffered ticks in one feature pass and one forward pass."""
+    features, _ = padded_features([tick[3] for tick in batch], [tick[2] for tick in batch])
+    probs = scorer(features, [tick[2] / 60 for tick in batch])
+    return [
+        [t, game_id, game_time, float(row[3]), float(row[9]), float(p[1] * 100), float(p[0] * 100)]
+        for (t, game_id, game_time, _), row, p in zip(batch, features, probs)
+    ]
+
+
+class RowWriter:
+    """Appends row batches to a CSV or Parquet file."""
+
+    def __init__(self, path, fmt):
+        self.fmt = fmt
+        if fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            self._pa = pa
+            self._schema = pa.schema([(name, pa.float64()) for name in COLUMNS])
+            self._writer = pq.ParquetWriter(path, self._schema)
+        else:
+            self._file = open(path, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(COLUMNS)
+
+    def write(self, rows):
+        if self.fmt == "parquet":
+            columns = [[float(row[i]) for row in rows] for i in range(len(COLUMNS))]
+            self._writer.write_table(self._pa.table(columns, schema=self._schema))
+        else:
+            self._writer.writerows(rows)
+
+    def close(self):
+        if self.fmt == "parquet":
+            self._writer.close()
+        else:
+            self._file.close()
+
+
+def score_file(path, output_path, fmt, batch_size):
+    """Score one file batch by batch; memory stays bounded by batch_size."""
+    writer = RowWriter(output_path, fmt)
+    ticks = 0
+    batch = []
+    try:
+        for tick in iter_ticks(path):
+            batch.append(tick)
+            if len(batch) == batch_size:
+                writer.write(score_batch(batch))
+                ticks += len(batch)
+                batch = []
+        if batch:
+            writer.write(score_batch(batch))
+            ticks += len(batch)
+    finally:
+        writer.close()
+    return ticks
+
+
+def output_name(path, fmt):
+    name = os.path.basename(path)
+    for suffix in (".gz", ".zst", ".jsonl", ".json"):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return f"{name}.{fmt}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--output-dir", default="scores")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--fused-path", default="model/fused.npz")
+    parser.add_argument("--backend", help="inference backend from backends.py, e.g. torch-int8")
+    parser.add_argument("--threads", type=int, default=1, help="intra-op threads per worker")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    with ProcessPoolExecutor(
+        max_workers=min(args.workers, len(args.paths)),
+        initializer=init_worker, initargs=(args.fused_path, args.backend, args.threads)
+    ) as pool:
+        futures = {
+            pool.submit(
+                score_file, path, os.path.join(args.output_dir, output_name(path, args.format)),
+                args.format, args.batch_size
+            ): path
+            for path in args.paths
+        }
+        failed = 0
+        for future in as_completed(futures):
+            try:
+                print(f"Scored {future.result()} ticks from {futures[future]}")
+            except Exception as e:
+                failed += 1
+                print(f"Error scoring {futures[future]}: {e}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
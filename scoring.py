@@ -0,0 +1,79 @@
+"""Lightweight NumPy scoring path for the win-probability model.
+
+Runs the frozen weights written by `python model.py`, where the input
+scaler and every BatchNorm are already folded into the Linear layers and
+Dropout is gone, so scoring needs neither torch nor sklearn.
+"""
+import os
+import numpy as np
+
+LEAKY_RELU_SLOPE = 0.01
+LAYERS = ("input", "hidden_0", "hidden_1", "hidden_2", "residual", "output")
+
+
+def time_based_temperature(game_time, max_temp=3.0, min_temp=1.0, max_time=10):
+    if game_time >= max_time:
+        return min_temp
+    else:
+        decay_ratio = game_time / max_time
+        return max_temp - decay_ratio * (max_temp - min_temp)
+
+
+def leaky_relu(x):
+    return np.where(x > 0, x, x * LEAKY_RELU_SLOPE)
+
+
+class FusedModel:
+    """ComplexTabularModel forward pass over folded (in, out) weight matrices."""
+
+    def __init__(self, weights):
+        self.layers = [(weights[f"{name}_weight"], weights[f"{name}_bias"]) for name in LAYERS]
+
+    @classmethod
+    def load(cls, path="model/fused.npz"):
+        with np.load(path) as weights:
+            return cls(dict(weights))
+
+    def logits(self, features):
+        """Raw [chaos, order] logits for unscaled (N, 12) features."""
+        x = np.asarray(features, dtype=np.float32).reshape(-1, 12)
+        (w_in, b_in), *hidden, (w_res, b_res), (w_out, b_out) = self.layers
+
+        x = leaky_relu(x @ w_in + b_in)
+        for weight, bias in hidden:
+            x = leaky_relu(x @ weight + bias)
+        x = x + leaky_relu(x @ w_res + b_res)
+        return x @ w_out + b_out
+
+    def win_probabilities(self, features, game_times):
+        """Temperature-scaled [chaos, order] win probabilities; game_times in minutes."""
+        return temperature_softmax(self.logits(features), game_times)
+
+
+def temperature_softmax(logits, game_times):
+    """Softmax of (N, 2) logits at each row's time-based temperature."""
+    temperature = np.array(
+        [time_based_temperature(t) for t in game_times], dtype=np.float32
+    ).reshape(-1, 1)
+    scaled = np.asarray(logits, dtype=np.float32) / temperature
+    exp = np.exp(scaled - scaled.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def make_scorer(fused_path="model/fused.npz", backend=None, threads=None):
+    """Return a (features, game_times) scorer, preferring the fused NumPy weights.
+
+    backend names one of the inference backends in backends.py instead.
+    Without it, torch and sklearn are only imported when the fused weights
+    are missing.
+    """
+    if backend:
+        from backends import make_backend
+        return make_backend(backend, threads=threads, fused_path=fused_path)
+
+    if os.path.exists(fused_path):
+        return FusedModel.load(fused_path).win_probabilities
+
+    from model import load_model, win_probabilities
+    model, scaler = load_model()
+    return lambda features, game_times: win_probabilities(model, scaler, features, game_times)
@@ -1,94 +1,1045 @@
-from flask import Flask, jsonify, request
+import asyncio
+import bisect
+import collections
+import gzip
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from flask import Flask, Response, abort, g, jsonify, request
 import requests
+from requests.adapters import HTTPAdapter
 from openai import OpenAI
 import urllib3
+import metrics
+from assets import AssetStore, item_ids
+from events import EventLog
+from features import fold_events, padded_features, snapshot_arrays
+from scoring import make_scorer
+from wire import event_list, snapshot_delta
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 app = Flask(__name__)
 
-# OpenAI API Key
-client = OpenAI(api_key="")
+# OpenAI API Key; OPENAI_BASE_URL can point at a local stub for testing
+client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY", ""), base_url=os.environ.get("OPENAI_BASE_URL"))
+
+# Live Clients to track as "id=url,id=url". LIVE_CLIENT_URL sets the single
+# default source and can point at a replay server (replay.py)
+live_client_url = os.environ.get("LIVE_CLIENT_URL", "https://127.0.0.1:2999")
+live_client_urls = os.environ.get("LIVE_CLIENT_URLS", f"local={live_client_url}")
+
+# Live Client endpoints and their timeouts in seconds (connect, read)
+endpoints = {
+    "player_data": ("/liveclientdata/playerlist", (1.0, 2.0)),
+    "game_stats": ("/liveclientdata/gamestats", (1.0, 1.0)),
+    "event_data": ("/liveclientdata/eventdata", (1.0, 2.0)),
+}
+
+# Seconds between background polls of every source; 0 polls only on demand
+poll_interval = float(os.environ.get("POLL_INTERVAL", "1.0"))
+
+# Failures in a row that open an endpoint's circuit, and its retry backoff bounds
+breaker_threshold = int(os.environ.get("BREAKER_THRESHOLD", "3"))
+breaker_backoff = (
+    float(os.environ.get("BREAKER_MIN_BACKOFF", "1.0")),
+    float(os.environ.get("BREAKER_MAX_BACKOFF", "30.0"))
+)
+
+# Seconds past the snapshot TTL that a stale snapshot is served while refreshing
+stale_ttl = float(os.environ.get("SNAPSHOT_STALE_TTL", "30.0"))
+
+# Folded model weights (python model.py) used to backfill /history
+fused_path = os.environ.get("FUSED_PATH", "model/fused.npz")
+
+
+def parse_sources(spec):
+    """Parse "id=url,id=url" into an ordered {id: url} mapping."""
+    sources = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        game_id, _, url = entry.rpartition("=")
+        sources[game_id or f"game{len(sources)}"] = url.rstrip("/")
+    return sources
+
+
+sources = parse_sources(live_client_urls)
+
+# One keep-alive session shared by all requests so the TLS handshake
+# with the game client is paid once per connection, not once per call
+session = requests.Session()
+session.verify = False
+adapter = HTTPAdapter(pool_connections=max(4, len(sources)), pool_maxsize=16)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+
+fetch_pool = ThreadPoolExecutor(max_workers=max(12, 3 * len(sources)), thread_name_prefix="liveclient")
+
+# Portraits and item metadata, from ASSET_DIR and fetched once when missing.
+# ASSET_OFFLINE=1 serves a pre-populated directory without going online.
+asset_store = AssetStore(
+    os.environ.get("ASSET_DIR", "assets"),
+    offline=os.environ.get("ASSET_OFFLINE", "0") == "1",
+    session=requests.Session()
+)
+asset_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assets")
+
+liveclient_seconds = metrics.histogram(
+    "liveclient_request_seconds", "Live Client request latency", ["endpoint"]
+)
+liveclient_errors = metrics.counter("liveclient_errors", "Failed Live Client requests", ["endpoint"])
+liveclient_skipped = metrics.counter(
+    "liveclient_short_circuits", "Live Client requests skipped by an open circuit", ["endpoint"]
+)
+poll_seconds = metrics.histogram("snapshot_poll_seconds", "Time to poll and record one snapshot", ["game"])
+summary_seconds = metrics.histogram(
+    "summary_generate_seconds", "LLM summary generation time",
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+)
+request_seconds = metrics.histogram(
+    "http_request_seconds", "Time to build a response, by route", ["route", "status"]
+)
+
+# Sampling profiler for /debug/profile, off unless PROFILE_INTERVAL is set
+profile_interval = float(os.environ.get("PROFILE_INTERVAL", "0"))
+profiler = metrics.SamplingProfiler(profile_interval) if profile_interval > 0 else None
+
+class UpstreamUnavailable(Exception):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Stops calling an endpoint that keeps failing.
+
+    After `threshold` failures in a row the circuit opens and calls fail fast.
+    Once the backoff has passed, one trial call is let through. Success closes
+    the circuit; failure reopens it with the backoff doubled, up to max_delay.
+    """
+
+    def __init__(self, threshold=3, min_delay=1.0, max_delay=30.0):
+        self.threshold = threshold
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.failures = 0
+        self.delay = min_delay
+        self.retry_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.retry_at is None:
+            return "closed"
+        return "half_open" if self._trial or time.monotonic() >= self.retry_at else "open"
 
-# URLs for data fetching
-player_url = "https://127.0.0.1:2999/liveclientdata/playerlist"
-game_stats_url = "https://127.0.0.1:2999/liveclientdata/gamestats"
-event_url = "https://127.0.0.1:2999/liveclientdata/eventdata"
+    def allow(self):
+        with self._lock:
+            if self.retry_at is None:
+                return True
+            if self._trial or time.monotonic() < self.retry_at:
+                return False
+            self._trial = True
+            return True
 
-def fetch_data(url):
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.delay = self.min_delay
+            self.retry_at = None
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if not self._trial and self.failures < self.threshold:
+                return
+            # Jitter keeps sources that failed together from retrying together
+            self.retry_at = time.monotonic() + self.delay * random.uniform(0.8, 1.2)
+            if self._trial:
+                self.delay = min(self.delay * 2, self.max_delay)
+            self._trial = False
+
+
+# Circuit breakers by endpoint URL
+breakers = {}
+breakers_lock = threading.Lock()
+
+
+def get_breaker(url):
+    with breakers_lock:
+        breaker = breakers.get(url)
+        if breaker is None:
+            breaker = breakers[url] = CircuitBreaker(breaker_threshold, *breaker_backoff)
+        return breaker
+
+
+def fetch_endpoint(url, timeout=(1.0, 2.0)):
+    """Fetch one Live Client endpoint through its circuit breaker; raises on failure."""
+    endpoint = urlsplit(url).path
+    breaker = get_breaker(url)
+    if not breaker.allow():
+        liveclient_skipped.inc(endpoint=endpoint)
+        raise UpstreamUnavailable(url)
+
+    start = time.perf_counter()
     try:
-        response = requests.get(url, verify=False)
+        response = session.get(url, timeout=timeout)
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+    except Exception:
+        breaker.failure()
+        liveclient_errors.inc(endpoint=endpoint)
+        raise
+    finally:
+        liveclient_seconds.observe(time.perf_counter() - start, endpoint=endpoint)
+    breaker.success()
+    return data
+
+
+def fetch_data(url, timeout=(1.0, 2.0)):
+    try:
+        return fetch_endpoint(url, timeout)
+    except UpstreamUnavailable:
+        return {}
     except Exception as e:
         print(f"Error fetching data from {url}: {e}")
         return {}
 
 
-@app.route('/data', methods=['GET'])
-def get_data():
-    player_data = fetch_data(player_url)
-    game_stats = fetch_data(game_stats_url)
-    event_data = fetch_data(event_url)
-
-    return jsonify({
-        "player_data": player_data,
-        "game_stats": game_stats,
-        "event_data": event_data
-    })
+def fetch_snapshot(base_url=live_client_url):
+    """Fetch players, game stats and events from a Live Client concurrently."""
+    futures = {
+        key: fetch_pool.submit(fetch_data, base_url + path, timeout)
+        for key, (path, timeout) in endpoints.items()
+    }
+    return {key: future.result() for key, future in futures.items()}
 
 
-@app.route('/summarize', methods=['GET'])
-def summarize_data():
-    try:
-        player_data = fetch_data(player_url)
-        game_stats = fetch_data(game_stats_url)
-        event_data = fetch_data(event_url)
-
-        # Simplify and reduce player data
-        simplified_players = []
-        for player in player_data:
-            simplified_players.append({
-                "name": player.get("summonerName", ""),
-                "champion": player.get("championName", ""),
-                "team": player.get("team", ""),
-                "kda": f"{player.get('scores', {}).get('kills', 0)}/{player.get('scores', {}).get('deaths', 0)}/{player.get('scores', {}).get('assists', 0)}"
-            })
+async def fetch_snapshot_async(base_url):
+    """Fetch every endpoint for the background asyncio poller.
 
-        # Take only essential game stats
-        simplified_game_stats = {
-            "gameTime": game_stats.get("gameTime", 0),
-            "gameMode": game_stats.get("gameMode", "")
-        }
+    Returns {key: response or the exception it raised}.
+    """
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(fetch_pool, fetch_endpoint, base_url + path, timeout)
+        for path, timeout in endpoints.values()
+    ), return_exceptions=True)
+    return dict(zip(endpoints, results))
+
+
+class SnapshotCache:
+    """Shares one Live Client poll between every request inside a TTL window.
+
+    Requests that arrive while a fetch is already running wait on that fetch
+    instead of starting their own. For stale_ttl seconds after the TTL, the
+    old snapshot is returned at once while a background fetch refreshes it.
+    """
+
+    def __init__(self, fetch, ttl=1.0, stale_ttl=0.0):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._fetched_at = 0.0
+        self._inflight = None
 
-        # Take only significant events
-        significant_events = []
-        if isinstance(event_data, list):
-            for event in event_data[-3:]:  # Only last 3 events
-                if event.get("EventName") in ["ChampionKill", "DragonKill", "BaronKill", "TurretKilled"]:
-                    significant_events.append({
-                        "type": event.get("EventName"),
-                        "killer": event.get("KillerName")
-                    })
-
-        limited_data = {
-            "game": simplified_game_stats,
-            "players": simplified_players,
-            "key_events": significant_events
+    def get(self):
+        with self._lock:
+            age = time.monotonic() - self._fetched_at
+            if self._snapshot is not None and age < self.ttl:
+                self.hits += 1
+                return self._snapshot
+            flight = self._inflight
+            if self._snapshot is not None and age < self.ttl + self.stale_ttl:
+                self.stale += 1
+                if flight is None:
+                    flight = self._inflight = {"done": threading.Event(), "snapshot": None, "error": None}
+                    threading.Thread(target=self._fetch, args=(flight,), name="revalidate", daemon=True).start()
+                return self._snapshot
+            if flight is None:
+                self.misses += 1
+                flight = self._inflight = {"done": threading.Event(), "snapshot": None, "error": None}
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight["done"].wait()
+            if flight["snapshot"] is None and flight["error"] is not None:
+                # The leader's fetch failed with nothing cached to fall back on
+                raise flight["error"]
+            return flight["snapshot"]
+        return self._fetch(flight)
+
+    def _fetch(self, flight):
+        try:
+            flight["snapshot"] = self.fetch()
+        except Exception as e:
+            flight["error"] = e
+            raise
+        finally:
+            with self._lock:
+                if flight["snapshot"] is not None:
+                    self._snapshot = flight["snapshot"]
+                    self._fetched_at = time.monotonic()
+                else:
+                    flight["snapshot"] = self._snapshot
+                self._inflight = None
+            flight["done"].set()
+        return flight["snapshot"]
+
+    def store(self, snapshot):
+        """Replace the cached snapshot with one polled in the background."""
+        with self._lock:
+            self._snapshot = snapshot
+            self._fetched_at = time.monotonic()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "stale": self.stale,
+            "ttl": self.ttl
         }
 
+
+class SnapshotHistory:
+    """Numbers distinct snapshots and keeps the most recent ones for deltas.
+
+    Versions start from the current time in milliseconds, so a version a
+    client kept from before a restart never matches a new snapshot.
+    """
+
+    def __init__(self, size=32):
+        self.version = int(time.time() * 1000)
+        self.size = size
+        self._snapshots = collections.OrderedDict()
+        self._fingerprint = None
+        self._lock = threading.Lock()
+
+    def record(self, snapshot):
+        """Stamp a snapshot with a version, bumped only when its content changed."""
+        fingerprint = hashlib.blake2b(json.dumps(snapshot, sort_keys=True).encode(), digest_size=16).digest()
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return self._snapshots[self.version]
+            self._fingerprint = fingerprint
+            self.version += 1
+            snapshot["version"] = self.version
+            self._snapshots[self.version] = snapshot
+            while len(self._snapshots) > self.size:
+                self._snapshots.popitem(last=False)
+            return snapshot
+
+    def get(self, version):
+        with self._lock:
+            return self._snapshots.get(version)
+
+
+class TickLog:
+    """Model inputs for every tick of the current game, for backfilling the chart.
+
+    Each distinct gameTime keeps its (teams, scores, event gold) arrays, with
+    event gold folded from the EventLog the same way the dashboard folds it.
+    Ticks are scored lazily: one batched forward pass over whatever has not
+    been scored yet, so the first viewer pays for the whole game once.
+    """
+
+    def __init__(self):
+        self.game_id = None
+        self.times = []
+        self.game_times = []
+        self.arrays = []
+        self.probabilities = []
+        self._cursor = -1
+        self._event_gold = {}
+        self._event_assists = {}
+        self._lock = threading.Lock()
+
+    def record(self, snapshot, event_log):
+        player_data = snapshot.get("player_data")
+        game_time = snapshot.get("game_stats", {}).get("gameTime")
+        with self._lock:
+            delta = event_log.since(self._cursor, self.game_id)
+            if delta["game_id"] != self.game_id:
+                self.game_id = delta["game_id"]
+                self.times, self.game_times, self.arrays, self.probabilities = [], [], [], []
+                self._event_gold, self._event_assists = {}, {}
+            fold_events(delta["events"], self._event_gold, self._event_assists)
+            self._cursor = delta["last_id"]
+
+            if not isinstance(player_data, list) or not player_data or not isinstance(game_time, (int, float)):
+                return
+            arrays = snapshot_arrays(player_data, event_gold=self._event_gold)
+            if self.game_times and game_time <= self.game_times[-1]:
+                # Same tick seen again (or a stale poll); keep the latest inputs
+                index = bisect.bisect_left(self.game_times, game_time)
+                if self.game_times[index] == game_time:
+                    self.arrays[index] = arrays
+                    del self.probabilities[index:]
+                return
+            self.times.append(time.time())
+            self.game_times.append(game_time)
+            self.arrays.append(arrays)
+
+    def scores(self, scorer, since=None):
+        """Win probabilities for every tick after gameTime `since`, as columns."""
+        with self._lock:
+            scored = len(self.probabilities)
+            if scored < len(self.arrays):
+                features, _ = padded_features(self.arrays[scored:], self.game_times[scored:])
+                probs = scorer(features, [game_time / 60 for game_time in self.game_times[scored:]])
+                self.probabilities.extend((float(p[1] * 100), float(p[0] * 100)) for p in probs)
+
+            start = bisect.bisect_right(self.game_times, since) if since is not None else 0
+            return {
+                "game_id": self.game_id,
+                "t": self.times[start:],
+                "game_time": self.game_times[start:],
+                "team_order_win": [order for order, _ in self.probabilities[start:]],
+                "team_chaos_win": [chaos for _, chaos in self.probabilities[start:]],
+            }
+
+
+# Scorer for /history, loaded on first use
+scorer = None
+scorer_lock = threading.Lock()
+
+
+def get_scorer():
+    global scorer
+    with scorer_lock:
+        if scorer is None:
+            scorer = make_scorer(fused_path)
+        return scorer
+
+
+def summary_input(snapshot):
+    """Reduce a snapshot to the small payload sent to the LLM."""
+    player_data = snapshot["player_data"]
+    game_stats = snapshot["game_stats"]
+    event_data = snapshot["event_data"]
+
+    # Simplify and reduce player data
+    simplified_players = []
+    for player in player_data:
+        simplified_players.append({
+            "name": player.get("summonerName", ""),
+            "champion": player.get("championName", ""),
+            "team": player.get("team", ""),
+            "kda": f"{player.get('scores', {}).get('kills', 0)}/{player.get('scores', {}).get('deaths', 0)}/{player.get('scores', {}).get('assists', 0)}"
+        })
+
+    # Take only essential game stats
+    simplified_game_stats = {
+        "gameTime": game_stats.get("gameTime", 0),
+        "gameMode": game_stats.get("gameMode", "")
+    }
+
+    # Take only significant events
+    significant_events = []
+    for event in (event_list(event_data) or [])[-3:]:  # Only last 3 events
+        if isinstance(event, dict) and event.get("EventName") in ["ChampionKill", "DragonKill", "BaronKill", "TurretKilled"]:
+            significant_events.append({
+                "type": event.get("EventName"),
+                "killer": event.get("KillerName")
+            })
+
+    return {
+        "game": simplified_game_stats,
+        "players": simplified_players,
+        "key_events": significant_events
+    }
+
+
+def openai_summarizer(client, model="gpt-4o"):
+    """Return a summarize(limited_data) function backed by a chat completion client."""
+    def summarize(limited_data):
         completion = client.chat.completions.create(
-            model="gpt-4o",
+            model=model,
             messages=[
                 {"role": "system", "content": "Provide a 2-3 sentence game summary focusing only on the most important events and state."},
                 {"role": "user", "content": str(limited_data)}
             ]
         )
-        return jsonify({"summary": completion.choices[0].message.content})
-    except Exception as e:
-        print(f"Error details: {str(e)}")
-        return jsonify({"error": "Failed to summarize data"}), 500
+        return completion.choices[0].message.content
+    return summarize
+
+
+class SummaryService:
+    """Generates game summaries in the background so requests never wait on the LLM.
+
+    A new summary is scheduled only when the significant-event set or a
+    team's kill count changes. Changes are debounced so a burst of events
+    costs one call, but a summary is never put off for more than max_wait
+    seconds. Results are cached by that event and kill set. `summarize` is
+    any limited_data -> text callable, so a local stub can replace the LLM.
+    """
+
+    def __init__(self, summarize, debounce=3.0, max_wait=15.0, cache_size=64):
+        self.summarize = summarize
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.cache_size = cache_size
+        self.summary = None
+        self.generated = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self._cache = collections.OrderedDict()
+        self._latest = None
+        self._events_key = None
+        self._pending_since = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def update(self, snapshot):
+        limited_data = summary_input(snapshot)
+        team_kills = collections.Counter()
+        for player in snapshot.get("player_data") or []:
+            if isinstance(player, dict):
+                team_kills[str(player.get("team"))] += player.get("scores", {}).get("kills", 0)
+        events_key = json.dumps([limited_data["key_events"], sorted(team_kills.items())])
+        with self._lock:
+            self._latest = limited_data
+            if events_key == self._events_key:
+                return
+            self._events_key = events_key
+
+            now = time.monotonic()
+            if self._pending_since is None:
+                self._pending_since = now
+            delay = min(self.debounce, max(0.0, self._pending_since + self.max_wait - now))
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, self._generate)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _generate(self):
+        with self._lock:
+            limited_data = self._latest
+            events_key = self._events_key
+            self._pending_since = None
+        key = hashlib.blake2b(events_key.encode(), digest_size=16).digest()
+
+        with self._lock:
+            summary = self._cache.get(key)
+            if summary is not None:
+                self.cache_hits += 1
+                self.summary = summary
+                return
+
+        try:
+            with summary_seconds.time():
+                summary = self.summarize(limited_data)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            print(f"Error details: {str(e)}")
+            return
+
+        with self._lock:
+            self._cache[key] = summary
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            self.summary = summary
+            self.generated += 1
+
+
+def put_latest(subscriber, message):
+    """Queue a message, dropping the oldest one if the subscriber has fallen behind."""
+    while True:
+        try:
+            subscriber.put_nowait(message)
+            return
+        except queue.Full:
+            try:
+                subscriber.get_nowait()
+            except queue.Empty:
+                pass
+
+
+class SnapshotBroadcaster:
+    """Pushes snapshots to every /stream subscriber from one upstream poller.
+
+    The poller thread only runs while someone is subscribed, and a message
+    is published only when the snapshot version changes. Delta subscribers
+    receive changes against the previously published snapshot.
+    """
+
+    def __init__(self, get_snapshot, interval=1.0):
+        self.get_snapshot = get_snapshot
+        self.interval = interval
+        self.published = 0
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._last_snapshot = None
+        self._thread = None
+
+    def subscribe(self, delta=False):
+        # Start from a fresh snapshot; the last published one is as old as the
+        # last time anyone was subscribed
+        try:
+            snapshot = self.get_snapshot()
+        except Exception as e:
+            print(f"Error publishing snapshot: {e}")
+            snapshot = None
+
+        subscriber = queue.Queue(maxsize=8)
+        with self._lock:
+            if snapshot is not None:
+                self._publish(snapshot)
+            self._subscribers[subscriber] = delta
+            if self._last_snapshot is not None:
+                subscriber.put((self._last_snapshot["version"], json.dumps(self._last_snapshot)))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="broadcaster", daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.pop(subscriber, None)
+
+    def publish(self, snapshot):
+        """Send a snapshot to all subscribers unless its version was already sent."""
+        with self._lock:
+            return self._publish(snapshot)
+
+    def _publish(self, snapshot):
+        previous = self._last_snapshot
+        if previous is not None and previous["version"] == snapshot["version"]:
+            return False
+        self._last_snapshot = snapshot
+        self.published += 1
+
+        full = json.dumps(snapshot)
+        delta = json.dumps(snapshot_delta(previous, snapshot)) if previous is not None else full
+        for subscriber, wants_delta in self._subscribers.items():
+            # Slow subscribers skip stale snapshots rather than block the poller
+            put_latest(subscriber, (snapshot["version"], delta if wants_delta else full))
+        return True
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            started = time.monotonic()
+            try:
+                self.publish(self.get_snapshot())
+            except Exception as e:
+                print(f"Error publishing snapshot: {e}")
+            time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+
+class GameSource:
+    """One tracked Live Client with its own cache, event log, history and summaries.
+
+    An endpoint that fails keeps serving its last good response, so a loading
+    screen or a restarting client shows the last known state instead of an
+    empty one; age() says how old that state is.
+    """
+
+    def __init__(self, game_id, url):
+        self.game_id = game_id
+        self.url = url
+        self.event_log = EventLog()
+        self.history = SnapshotHistory()
+        self.ticks = TickLog()
+        self.summaries = SummaryService(
+            openai_summarizer(client),
+            debounce=float(os.environ.get("SUMMARY_DEBOUNCE", "3.0")),
+            max_wait=float(os.environ.get("SUMMARY_MAX_WAIT", "15.0"))
+        )
+        self.cache = SnapshotCache(
+            self.poll, ttl=float(os.environ.get("SNAPSHOT_TTL", "1.0")), stale_ttl=stale_ttl
+        )
+        # Last good response and its monotonic fetch time, by endpoint key
+        self.last_good = {}
+        self.champions = None
+        # The cache's fetch thread and the background poller both record;
+        # snapshots are recorded one at a time, in the order fetches started
+        self._record_lock = threading.Lock()
+        self._recorded_started = float("-inf")
+        self._recorded = None
+        self.broadcaster = SnapshotBroadcaster(
+            self.cache.get, interval=float(os.environ.get("STREAM_INTERVAL", "1.0"))
+        )
+
+    def fetch_results(self):
+        """{key: response or exception} for every Live Client endpoint."""
+        futures = {
+            key: fetch_pool.submit(fetch_endpoint, self.url + path, timeout)
+            for key, (path, timeout) in endpoints.items()
+        }
+        return {key: future.exception() or future.result() for key, future in futures.items()}
+
+    def merge(self, results):
+        """Build a snapshot from {key: response or exception}, filling failures
+        with the last good response."""
+        now = time.monotonic()
+        snapshot = {}
+        for key, result in results.items():
+            if isinstance(result, Exception):
+                if not isinstance(result, UpstreamUnavailable):
+                    print(f"Error fetching {key} for {self.game_id}: {result}")
+                snapshot[key] = self.last_good.get(key, ({}, None))[0]
+            else:
+                self.last_good[key] = (result, now)
+                snapshot[key] = result
+        return snapshot
+
+    def age(self):
+        """Seconds since the oldest part of the current snapshot was fetched, or None."""
+        fetched = [fetched_at for _, fetched_at in self.last_good.values()]
+        if len(fetched) < len(endpoints):
+            return None
+        return time.monotonic() - min(fetched)
+
+    def record(self, results, started=None):
+        """Merge fetched {key: response or exception} results into a snapshot,
+        record its new events, feed the summaries and stamp its version.
+
+        started is the monotonic time the fetch began. Results whose fetch
+        began before the last recorded one are older data that finished late;
+        they are dropped, since their earlier gameTime would look like a new
+        game, and the last recorded snapshot is returned instead. Dropped
+        results never become the last good response either.
+        """
+        with self._record_lock:
+            if started is not None:
+                if started < self._recorded_started and self._recorded is not None:
+                    return self._recorded
+                self._recorded_started = started
+            snapshot = self.merge(results)
+            self.prepare_assets(snapshot.get("player_data"))
+            # Item names and prices come from the asset manifest, not every payload
+            snapshot["player_data"] = item_ids(snapshot.get("player_data"))
+            self.event_log.ingest(snapshot)
+            # Lets stream clients fold events straight from the snapshot and
+            # tell a new game from a late message
+            snapshot["event_game_id"] = self.event_log.game_id
+            self.ticks.record(snapshot, self.event_log)
+            self.summaries.update(snapshot)
+            self._recorded = self.history.record(snapshot)
+            return self._recorded
+
+    def prepare_assets(self, player_data):
+        """Learn item metadata and prefetch portraits once per champion line-up."""
+        if not isinstance(player_data, list):
+            return
+        asset_store.learn_items(player_data)
+        champions = sorted({p.get("championName", "") for p in player_data if isinstance(p, dict)} - {""})
+        if champions != self.champions:
+            self.champions = champions
+            asset_pool.submit(asset_store.prefetch, champions)
+
+    def poll(self):
+        with poll_seconds.time(game=self.game_id):
+            started = time.monotonic()
+            return self.record(self.fetch_results(), started)
+
+    async def poll_async(self):
+        with poll_seconds.time(game=self.game_id):
+            started = time.monotonic()
+            results = await fetch_snapshot_async(self.url)
+            self.cache.store(self.record(results, started))
+
+    def status(self):
+        return {
+            "id": self.game_id,
+            "url": self.url,
+            "version": self.history.version,
+            "game_time": self.event_log.game_time,
+            "event_game_id": self.event_log.game_id,
+            "events": len(self.event_log.events),
+            "age": self.age(),
+            "circuits": {key: get_breaker(self.url + path).state for key, (path, _) in endpoints.items()},
+            "cache": self.cache.stats(),
+            "summaries": self.summaries.generated
+        }
+
+
+games = {game_id: GameSource(game_id, url) for game_id, url in sources.items()}
+default_game = next(iter(games.values()))
+
+
+def game_stats(read):
+    """Scrape-time reader of a per-game number for the metrics registry."""
+    return lambda: {(game.game_id,): read(game) for game in games.values()}
+
+
+cache_results = metrics.counter("snapshot_cache_requests", "Snapshot cache lookups", ["game", "result"])
+cache_results.set_function(lambda: {
+    (game.game_id, result): game.cache.stats()[field]
+    for game in games.values()
+    for result, field in (("hit", "hits"), ("miss", "misses"), ("coalesced", "coalesced"), ("stale", "stale"))
+})
+metrics.counter("summary_generations", "LLM summaries generated", ["game"]).set_function(
+    game_stats(lambda game: game.summaries.generated)
+)
+metrics.counter("summary_cache_hits", "Summaries served from the summary cache", ["game"]).set_function(
+    game_stats(lambda game: game.summaries.cache_hits)
+)
+metrics.counter("summary_errors", "Failed LLM summary calls", ["game"]).set_function(
+    game_stats(lambda game: game.summaries.errors)
+)
+metrics.gauge("stream_subscribers", "Open /stream connections", ["game"]).set_function(
+    game_stats(lambda game: len(game.broadcaster._subscribers))
+)
+metrics.gauge("game_events", "Events recorded for the current game", ["game"]).set_function(
+    game_stats(lambda game: len(game.event_log.events))
+)
+metrics.gauge("snapshot_age_seconds", "Age of the oldest part of the served snapshot", ["game"]).set_function(
+    lambda: {(game.game_id,): game.age() for game in games.values() if game.age() is not None}
+)
+metrics.gauge("liveclient_circuit_open", "1 while an endpoint's circuit is open", ["url"]).set_function(
+    lambda: {(url,): int(breaker.state != "closed") for url, breaker in list(breakers.items())}
+)
+
+
+def get_game(game_id):
+    """The source for a /games/<id>/ route, or the default source for bare routes."""
+    if game_id is None:
+        return default_game
+    game = games.get(game_id)
+    if game is None:
+        abort(404)
+    return game
+
+
+async def poll_forever(game, interval):
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        try:
+            await game.poll_async()
+        except Exception as e:
+            print(f"Error polling {game.game_id}: {e}")
+        await asyncio.sleep(max(0.0, interval - (loop.time() - started)))
+
+
+async def poll_all(interval):
+    await asyncio.gather(*(poll_forever(game, interval) for game in games.values()))
+
+
+def start_polling(interval):
+    """Poll every source concurrently on one asyncio loop in a background thread."""
+    thread = threading.Thread(target=asyncio.run, args=(poll_all(interval),), name="poller", daemon=True)
+    thread.start()
+    return thread
+
+
+# Encoded /data bodies by (game, version, since, encoding), shared by every viewer
+encoded_responses = {}
+
+
+def encode_json(body, key):
+    """Serialize and compress a body for the current request's Accept-Encoding."""
+    if zstandard is not None and request.accept_encodings.quality("zstd") > 0:
+        encoding = "zstd"
+    elif request.accept_encodings.quality("gzip") > 0:
+        encoding = "gzip"
+    else:
+        encoding = None
+
+    # Keyed by the requested encoding; small bodies are stored uncompressed under it
+    cached = encoded_responses.get((*key, encoding))
+    if cached is not None:
+        return cached
+
+    requested = encoding
+    payload = json.dumps(body).encode()
+    if len(payload) < 1024:
+        encoding = None
+    elif encoding == "zstd":
+        payload = zstandard.ZstdCompressor(level=3).compress(payload)
+    elif encoding == "gzip":
+        payload = gzip.compress(payload, compresslevel=5)
+
+    if len(encoded_responses) >= 128:
+        encoded_responses.clear()
+    encoded_responses[(*key, requested)] = (payload, encoding)
+    return payload, encoding
+
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request(response):
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    elapsed = time.perf_counter() - g.get("request_start", time.perf_counter())
+    request_seconds.observe(elapsed, route=route, status=response.status_code)
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+@app.route('/debug/profile', methods=['GET'])
+def get_profile():
+    """Folded stacks from the sampling profiler, for flamegraph.pl or speedscope."""
+    if profiler is None:
+        abort(404)
+    return Response(profiler.folded(), mimetype="text/plain")
+
+
+@app.route('/assets/manifest', methods=['GET'])
+def asset_manifest():
+    """Content-hashed portrait URLs and item names and prices by item ID."""
+    response = jsonify(asset_store.manifest())
+    response.add_etag()
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+
+@app.route('/assets/champions/<name>', methods=['GET'])
+def champion_portrait(name):
+    key, _, digest = name.rpartition(".")
+    entry = asset_store.portrait(key, digest)
+    if entry is None:
+        abort(404)
+    return Response(entry[2], mimetype=entry[1], headers={
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "ETag": f'"{entry[0]}"'
+    })
+
+
+@app.route('/games', methods=['GET'])
+def list_games():
+    return jsonify([game.status() for game in games.values()])
+
+
+@app.route('/data', methods=['GET'])
+@app.route('/games/<game_id>/data', methods=['GET'])
+def get_data(game_id=None):
+    """Current snapshot, or a delta against ?since=<version> when we still have it.
+
+    The version is sent as a weak ETag, since the same version is served
+    gzip, zstd or uncompressed, so If-None-Match gets a 304 while the game
+    has not changed. Age is how long ago the oldest part of the snapshot
+    was fetched, which grows while the Live Client is unreachable.
+    """
+    game = get_game(game_id)
+    snapshot = game.cache.get()
+    version = snapshot["version"]
+    headers = {"ETag": f'W/"{version}"', "Vary": "Accept-Encoding"}
+    age = game.age()
+    if age is not None:
+        headers["Age"] = str(int(age))
+    if request.if_none_match.contains_weak(str(version)):
+        return Response(status=304, headers=headers)
+
+    since = request.args.get("since", type=int)
+    base = game.history.get(since) if since is not None else None
+    body = snapshot_delta(base, snapshot) if base is not None else snapshot
+
+    payload, encoding = encode_json(body, (game.game_id, version, since if base is not None else None))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(payload, mimetype="application/json", headers=headers)
+
+
+@app.route('/stream', methods=['GET'])
+@app.route('/games/<game_id>/stream', methods=['GET'])
+def stream(game_id=None):
+    """Server-Sent Events stream of snapshots, sent only when they change.
+
+    With ?delta=1 every message after the first is a delta (see wire.py).
+    """
+    broadcaster = get_game(game_id).broadcaster
+    subscriber = broadcaster.subscribe(delta=request.args.get("delta") == "1")
+
+    def messages():
+        try:
+            while True:
+                try:
+                    version, payload = subscriber.get(timeout=15)
+                    yield f"id: {version}\ndata: {payload}\n\n"
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+        finally:
+            broadcaster.unsubscribe(subscriber)
+
+    return Response(messages(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+
+@app.route('/events', methods=['GET'])
+@app.route('/games/<game_id>/events', methods=['GET'])
+def get_events(game_id=None):
+    game = get_game(game_id)
+    game.cache.get()
+    return jsonify(game.event_log.since(
+        request.args.get("since", -1, type=int),
+        request.args.get("game", type=int)
+    ))
+
+
+@app.route('/history', methods=['GET'])
+@app.route('/games/<game_id>/history', methods=['GET'])
+def get_history(game_id=None):
+    """Win probability at every recorded tick of the current game, by gameTime.
+
+    ?since=<gameTime> returns only later ticks; ?game=<id> is the EventLog
+    game id the caller holds, and a different game returns every tick.
+    """
+    game = get_game(game_id)
+    game.cache.get()
+    since = request.args.get("since", type=float)
+    if request.args.get("game", type=int) != game.ticks.game_id:
+        since = None
+    return jsonify(game.ticks.scores(get_scorer(), since))
+
+
+@app.route('/cache/stats', methods=['GET'])
+@app.route('/games/<game_id>/cache/stats', methods=['GET'])
+def cache_stats(game_id=None):
+    return jsonify(get_game(game_id).cache.stats())
+
+
+@app.route('/summarize', methods=['GET'])
+@app.route('/games/<game_id>/summarize', methods=['GET'])
+def summarize_data(game_id=None):
+    """Latest background summary; never waits on the LLM."""
+    game = get_game(game_id)
+    # Polling feeds the summary service whenever the cached snapshot is stale
+    game.cache.get()
+    if game.summaries.summary is None:
+        return jsonify({}), 202
+    return jsonify({"summary": game.summaries.summary})
 
 
 if __name__ == "__main__":
+    if profiler is not None:
+        profiler.start()
+    if poll_interval > 0:
+        start_polling(poll_interval)
     app.run(host="0.0.0.0", port=5000, debug=False)
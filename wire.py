@@ -0,0 +1,95 @@
+"""Delta encoding of Live Client snapshots between send.py and the dashboard.
+
+A delta carries the version it was taken against ("base") and only what
+changed since then:
+
+    game_stats   full game stats, when they changed
+    player_data  the full player list, when players joined, left or moved
+    players      {index: {field: value}} for changed fields of existing players
+    event_data   the full event data, when the history was rewritten
+    new_events   events appended since the base version
+    event_game_id  send.py's EventLog game id, when a new game started
+"""
+
+
+def event_list(event_data):
+    """Return the events list for either Live Client shape, or None."""
+    if isinstance(event_data, dict):
+        return event_data.get("Events") if isinstance(event_data.get("Events"), list) else None
+    return event_data if isinstance(event_data, list) else None
+
+
+def _players_delta(old_players, new_players, delta):
+    if not isinstance(old_players, list) or not isinstance(new_players, list) \
+            or len(old_players) != len(new_players):
+        delta["player_data"] = new_players
+        return
+
+    changed = {}
+    for index, (old, new) in enumerate(zip(old_players, new_players)):
+        if old == new:
+            continue
+        if not isinstance(old, dict) or not isinstance(new, dict) or old.keys() != new.keys() \
+                or old.get("summonerName") != new.get("summonerName"):
+            delta["player_data"] = new_players
+            return
+        changed[str(index)] = {key: value for key, value in new.items() if old[key] != value}
+    if changed:
+        delta["players"] = changed
+
+
+def _events_delta(old_data, new_data, delta):
+    if old_data == new_data:
+        return
+    old_events = event_list(old_data)
+    new_events = event_list(new_data)
+    appended = (
+        old_events is not None and new_events is not None
+        and type(old_data) is type(new_data)
+        and len(new_events) >= len(old_events)
+        and (not old_events or new_events[len(old_events) - 1] == old_events[-1])
+    )
+    if appended:
+        delta["new_events"] = new_events[len(old_events):]
+    else:
+        delta["event_data"] = new_data
+
+
+def snapshot_delta(old, new):
+    """Describe how to turn snapshot `old` into snapshot `new`."""
+    delta = {"version": new.get("version"), "base": old.get("version")}
+    if old.get("game_stats") != new.get("game_stats"):
+        delta["game_stats"] = new.get("game_stats")
+    _players_delta(old.get("player_data"), new.get("player_data"), delta)
+    _events_delta(old.get("event_data"), new.get("event_data"), delta)
+    if old.get("event_game_id") != new.get("event_game_id"):
+        delta["event_game_id"] = new.get("event_game_id")
+    return delta
+
+
+def apply_delta(old, delta):
+    """Return the snapshot produced by applying `delta` to `old` (left unchanged)."""
+    snapshot = dict(old)
+    snapshot["version"] = delta["version"]
+    if "game_stats" in delta:
+        snapshot["game_stats"] = delta["game_stats"]
+    if "event_game_id" in delta:
+        snapshot["event_game_id"] = delta["event_game_id"]
+
+    if "player_data" in delta:
+        snapshot["player_data"] = delta["player_data"]
+    elif "players" in delta:
+        players = list(old["player_data"])
+        for index, fields in delta["players"].items():
+            players[int(index)] = {**players[int(index)], **fields}
+        snapshot["player_data"] = players
+
+    if "event_data" in delta:
+        snapshot["event_data"] = delta["event_data"]
+    elif "new_events" in delta:
+        event_data = old["event_data"]
+        if isinstance(event_data, dict):
+            snapshot["event_data"] = {**event_data, "Events": event_data["Events"] + delta["new_events"]}
+        else:
+            snapshot["event_data"] = event_data + delta["new_events"]
+    return snapshot